@@ -1,6 +1,10 @@
+from .aio import AsyncTrajectory
 from .atom import Atom
+from .cache import CachedTrajectory
 from .cell import CellShape, UnitCell
-from .frame import Frame
+from .chain import ChainTrajectory
+from .export import export_npy, load_npy
+from .frame import Frame, FrameArray
 from .misc import (
     ChemfilesError,
     add_configuration,
@@ -8,10 +12,14 @@ from .misc import (
     guess_format,
     set_warnings_callback,
 )
+from .parallel import map_frames
+from .pipeline import convert
+from .pool import TrajectoryPool
+from .prefetch import PrefetchingTrajectory
 from .property import Property
 from .residue import Residue
 from .selection import Selection
 from .topology import BondOrder, Topology
-from .trajectory import MemoryTrajectory, Trajectory
+from .trajectory import MemoryTrajectory, StreamingTrajectory, Trajectory
 
 __version__ = "0.10.4"
@@ -0,0 +1,131 @@
+import asyncio
+import collections
+from concurrent.futures import ThreadPoolExecutor
+
+from .misc import ChemfilesError
+from .trajectory import Trajectory
+
+
+class AsyncTrajectory(object):
+    """
+    An :py:class:`AsyncTrajectory` allows reading a :py:class:`Trajectory` from
+    ``asyncio`` code without blocking the event loop.
+
+    The file is opened, parsed and closed on a dedicated thread, and all the
+    methods of this class are coroutines waiting for the corresponding
+    operation to finish on this thread.
+
+    .. code-block:: python
+
+        async with AsyncTrajectory("water.xyz") as trajectory:
+            async for frame in trajectory:
+                ...
+    """
+
+    def __init__(self, path, format=""):
+        """
+        Open the file at the given ``path`` for reading, using the optional
+        file ``format``. The file is opened in the background, and any error is
+        reported by the first method call.
+        """
+        self.__executor = ThreadPoolExecutor(max_workers=1)
+        self.__opening = self.__executor.submit(Trajectory, path, "r", format)
+        self.__closed = False
+        self.__path = path
+
+    def __check_opened(self):
+        if self.__closed:
+            raise ChemfilesError("Can not use a closed AsyncTrajectory")
+
+    async def __run(self, function, *args):
+        self.__check_opened()
+        return await asyncio.wrap_future(self.__executor.submit(function, *args))
+
+    def __call_trajectory(self, name, *args):
+        # called on the executor thread, after the file was opened
+        trajectory = self.__opening.result()
+        return getattr(trajectory, name)(*args)
+
+    async def __aenter__(self):
+        self.__check_opened()
+        try:
+            await asyncio.wrap_future(self.__opening)
+        except BaseException:
+            await self.close()
+            raise
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    def __aiter__(self):
+        return self.frames()
+
+    def __repr__(self):
+        return f"AsyncTrajectory('{self.__path}')"
+
+    async def read(self):
+        """
+        Read the next step of this trajectory and return the corresponding
+        :py:class:`Frame`.
+        """
+        return await self.__run(self.__call_trajectory, "read")
+
+    async def read_step(self, step):
+        """
+        Read a specific ``step`` in this trajectory and return the
+        corresponding :py:class:`Frame`.
+        """
+        return await self.__run(self.__call_trajectory, "read_step", step)
+
+    async def nsteps(self):
+        """Get the number of steps in this trajectory."""
+        return await self.__run(lambda: self.__opening.result().nsteps)
+
+    async def frames(self, steps=None, prefetch=2):
+        """
+        Asynchronously iterate over the frames at the given ``steps`` (all the
+        steps by default) of this trajectory.
+
+        At most ``prefetch`` frames are read ahead of the consumer, and reading
+        stops when the consumer stops iterating or is cancelled.
+        """
+        if steps is None:
+            steps = range(await self.nsteps())
+
+        steps = iter(steps)
+        pending = collections.deque()
+        try:
+            while True:
+                for step in steps:
+                    pending.append(asyncio.ensure_future(self.read_step(step)))
+                    if len(pending) >= prefetch:
+                        break
+
+                if not pending:
+                    return
+
+                yield await pending.popleft()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def close(self):
+        """
+        Close this trajectory, waiting for any pending read to finish.
+        """
+        self.__check_opened()
+        self.__closed = True
+
+        def close():
+            try:
+                trajectory = self.__opening.result()
+            except BaseException:
+                # the file could not be opened, there is nothing to close
+                return
+            trajectory.close()
+
+        try:
+            await asyncio.wrap_future(self.__executor.submit(close))
+        finally:
+            self.__executor.shutdown(wait=False)
@@ -1,5 +1,8 @@
-from ctypes import c_char_p, c_double, c_uint64
+from ctypes import c_char_p, c_double, c_uint64, create_string_buffer
 
+import numpy as np
+
+from ._c_lib import _get_c_library
 from .misc import ChemfilesError
 from .property import Property
 from .utils import CxxPointer, _call_with_growing_buffer
@@ -35,10 +38,7 @@ class Atom(CxxPointer):
         return Atom.from_mutable_ptr(None, self.ffi.chfl_atom_copy(self.ptr))
 
     def __repr__(self):
-        if self.type == self.name:
-            return f"Atom('{self.name}')"
-        else:
-            return f"Atom('{self.name}', '{self.type}')"
+        return _atom_repr(self.name, self.type)
 
     @property
     def mass(self):
@@ -177,3 +177,198 @@ class Atom(CxxPointer):
         names = StringArray()
         self.ffi.chfl_atom_list_properties(self.ptr, names, count)
         return list(map(lambda n: n.decode("utf8"), names))
+
+
+class _AtomsArrays(object):
+    """
+    Bulk access to the properties of all the atoms in a frame or topology, as
+    numpy arrays. The classes using this must define ``__len__`` and
+    ``_atom_ptr(index, mutable)``, returning a new C pointer to the atom at
+    ``index``, which will be freed with ``chfl_free``.
+    """
+
+    def __atoms_values(self, getter, value, dtype):
+        ptr = self._atom_ptr
+        ffi = _get_c_library()
+        get = getattr(ffi, getter)
+        free = ffi.chfl_free
+
+        count = len(self)
+        values = np.empty(count, dtype=dtype)
+        for i in range(count):
+            atom = ptr(i, False)
+            try:
+                get(atom, value)
+            finally:
+                free(atom)
+            values[i] = value.value
+        return values
+
+    def __atoms_strings(self, getter):
+        """
+        Get the strings returned by ``getter`` for all atoms, as an array of
+        integer codes and the list of unique strings the codes refer to.
+        """
+        ptr = self._atom_ptr
+        ffi = _get_c_library()
+        get = getattr(ffi, getter)
+        free = ffi.chfl_free
+
+        size = c_uint64(32)
+        buffer = create_string_buffer(size.value)
+        # most atoms share the same few names and types, so only decode each
+        # different value once
+        known = {}
+        strings = []
+
+        count = len(self)
+        codes = np.empty(count, dtype=np.int64)
+        for i in range(count):
+            atom = ptr(i, False)
+            try:
+                get(atom, buffer, size)
+                while buffer[size.value - 2] != b"\0":
+                    # the buffer was too small, grow it and try again
+                    size = c_uint64(2 * size.value)
+                    buffer = create_string_buffer(size.value)
+                    get(atom, buffer, size)
+            finally:
+                free(atom)
+
+            raw = buffer.value
+            code = known.get(raw)
+            if code is None:
+                code = len(strings)
+                known[raw] = code
+                strings.append(raw.decode("utf8"))
+            codes[i] = code
+            # reset the end of buffer for the size check
+            buffer[size.value - 2] = b"\0"
+        return codes, strings
+
+    def categorical(self, kind):
+        """
+        Get the names (if ``kind`` is ``"name"``) or types (if ``kind`` is
+        ``"type"``) of all the atoms as categorical data: an array of integer
+        codes, one for each atom, and the list of unique strings the codes
+        refer to, such that ``strings[codes[i]]`` is the name or type of the
+        atom ``i``.
+
+        This is faster than getting the strings for each atom, since each
+        unique string is only decoded once; and the codes can directly be used
+        to group atoms with numpy. When all the steps of a trajectory share the
+        same topology, this only needs to be called once on
+        :py:func:`Trajectory.topology`.
+        """
+        if kind == "name":
+            return self.__atoms_strings("chfl_atom_name")
+        elif kind == "type":
+            return self.__atoms_strings("chfl_atom_type")
+        else:
+            raise ChemfilesError(
+                f"unknown kind '{kind}' in categorical, expected 'name' or 'type'"
+            )
+
+    def __set_atoms_values(self, setter, values, convert):
+        ptr = self._atom_ptr
+        ffi = _get_c_library()
+        set_value = getattr(ffi, setter)
+        free = ffi.chfl_free
+
+        count = len(self)
+        if len(values) != count:
+            raise ChemfilesError(
+                f"expected {count} values to set on the atoms, got {len(values)}"
+            )
+
+        for i, value in enumerate(values):
+            atom = ptr(i, True)
+            try:
+                set_value(atom, convert(value))
+            finally:
+                free(atom)
+
+    @property
+    def masses(self):
+        """Get the masses of all the atoms, in atomic mass units."""
+        return self.__atoms_values("chfl_atom_mass", c_double(), np.float64)
+
+    @masses.setter
+    def masses(self, masses):
+        """
+        Set the masses of all the atoms, from an array or a single value used
+        for all atoms.
+        """
+        masses = np.broadcast_to(np.asarray(masses, dtype=np.float64), len(self))
+        self.__set_atoms_values("chfl_atom_set_mass", masses, c_double)
+
+    @property
+    def charges(self):
+        """Get the charges of all the atoms, in number of the electron charge."""
+        return self.__atoms_values("chfl_atom_charge", c_double(), np.float64)
+
+    @charges.setter
+    def charges(self, charges):
+        """
+        Set the charges of all the atoms, from an array or a single value used
+        for all atoms.
+        """
+        charges = np.broadcast_to(np.asarray(charges, dtype=np.float64), len(self))
+        self.__set_atoms_values("chfl_atom_set_charge", charges, c_double)
+
+    @property
+    def names(self):
+        """Get the names of all the atoms, as an array of strings."""
+        codes, strings = self.categorical("name")
+        return np.array(strings, dtype=str)[codes]
+
+    @names.setter
+    def names(self, names):
+        """Set the names of all the atoms from a sequence of strings."""
+        self.__set_atoms_values("chfl_atom_set_name", names, _encode)
+
+    @property
+    def types(self):
+        """Get the types of all the atoms, as an array of strings."""
+        codes, strings = self.categorical("type")
+        return np.array(strings, dtype=str)[codes]
+
+    @types.setter
+    def types(self, types):
+        """Set the types of all the atoms from a sequence of strings."""
+        self.__set_atoms_values("chfl_atom_set_type", types, _encode)
+
+    @property
+    def atomic_numbers(self):
+        """
+        Get the atomic numbers of all the atoms, using 0 for atoms where the
+        atomic number can not be found.
+        """
+        return self.__atoms_values("chfl_atom_atomic_number", c_uint64(), np.uint64)
+
+    @property
+    def vdw_radii(self):
+        """
+        Get the Van der Waals radii of all the atoms, using 0 for atoms where
+        the radius can not be found.
+        """
+        return self.__atoms_values("chfl_atom_vdw_radius", c_double(), np.float64)
+
+    @property
+    def covalent_radii(self):
+        """
+        Get the covalent radii of all the atoms, using 0 for atoms where the
+        radius can not be found.
+        """
+        return self.__atoms_values("chfl_atom_covalent_radius", c_double(), np.float64)
+
+
+def _atom_repr(name, type):
+    if type == name:
+        return f"Atom('{name}')"
+    else:
+        return f"Atom('{name}', '{type}')"
+
+
+def _encode(value):
+    return value.encode("utf8")
@@ -0,0 +1,411 @@
+import io
+import json
+import os
+import zipfile
+import zlib
+
+import numpy as np
+
+from .atom import Atom
+from .cell import CellShape, UnitCell
+from .frame import Frame
+from .misc import ChemfilesError
+from .residue import Residue
+from .topology import Topology
+from .trajectory import (
+    Trajectory,
+    _file_metadata,
+    _index_trajectory,
+    _normalize_range,
+    _normalize_step,
+    _shared_topology,
+)
+
+# version of the cache file format, to be updated on incompatible changes
+_CACHE_VERSION = 1
+
+
+class CachedTrajectory(object):
+    """
+    A :py:class:`CachedTrajectory` reads a trajectory from a compressed cache
+    file, created from the original file the first time it is opened. Reading
+    from the cache is usually a lot faster than parsing text formats (XYZ,
+    PDB, ...) again, which makes it useful when running multiple analyses on
+    the same trajectory.
+
+    The cache is stored next to the trajectory (in ``<path>.chfl-cache``) by
+    default. It contains the positions (and velocities if any) of the atoms,
+    stored by chunks of consecutive frames and compressed with :py:mod:`zlib`;
+    together with the step and unit cell of each frame. The topology is
+    stored only once, from the first frame of the trajectory, and all the
+    frames must contain the same number of atoms. Properties of atoms,
+    residues and frames are not stored in the cache.
+
+    The cache is re-created if the original file is modified.
+
+    .. code-block:: python
+
+        with CachedTrajectory("water.xyz") as trajectory:
+            for frame in trajectory:
+                ...
+    """
+
+    __closed = True
+
+    def __init__(self, path, format="", cache=None, chunk=64):
+        """
+        Open the cache for the trajectory at the given ``path``, creating it
+        if needed by reading the trajectory with the optional ``format``.
+
+        The cache file is stored at ``cache`` if given, and in
+        ``<path>.chfl-cache`` otherwise. When creating the cache, the frames
+        are grouped by ``chunk`` consecutive frames before compression.
+        """
+        if chunk < 1:
+            raise ChemfilesError(
+                f"'chunk' must be at least 1 in CachedTrajectory, got {chunk}"
+            )
+
+        if cache is None:
+            cache = path + ".chfl-cache"
+
+        self.__path = path
+        metadata = _file_metadata(path, format)
+        self.__file = _open_cache(cache, metadata)
+        if self.__file is None:
+            _write_cache(path, format, cache, chunk, metadata)
+            self.__file = _open_cache(cache, metadata)
+            if self.__file is None:
+                raise ChemfilesError(f"failed to create cache file at '{cache}'")
+        self.__closed = False
+
+        header = json.loads(self.__file.read("header.json"))
+        self.__nsteps = header["nsteps"]
+        self.__natoms = header["natoms"]
+        self.__chunk = header["chunk"]
+        self.__has_velocities = header["velocities"]
+
+        self.__steps = _read_array(self.__file, "steps.npy")
+        self.__cells = _read_array(self.__file, "cells.npy")
+        self.__shapes = _read_array(self.__file, "shapes.npy")
+        topology = _topology_from_json(json.loads(self.__file.read("topology.json")))
+        self.__topology = _shared_topology(topology)
+
+        # last decompressed chunk, as (kind, index, array)
+        self.__last_chunk = None
+        self.__position = 0
+
+    def __check_opened(self):
+        if self.__closed:
+            raise ChemfilesError("Can not use a closed CachedTrajectory")
+
+    def __del__(self):
+        if not self.__closed:
+            self.close()
+
+    def __enter__(self):
+        self.__check_opened()
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self.nsteps
+
+    def __iter__(self):
+        self.__check_opened()
+        for step in range(self.nsteps):
+            yield self.read_step(step)
+
+    def __getitem__(self, index):
+        """
+        Get the :py:class:`Frame` at the given step ``index``, or a lazy
+        sequence of frames, with the same semantics as
+        :py:func:`Trajectory.__getitem__`.
+        """
+        self.__check_opened()
+        return _index_trajectory(self, index)
+
+    def __repr__(self):
+        return f"CachedTrajectory('{self.__path}')"
+
+    def __chunk_data(self, kind, index):
+        """Get the decompressed ``kind`` data for the chunk at ``index``"""
+        if self.__last_chunk is not None:
+            last_kind, last_index, data = self.__last_chunk
+            if last_kind == kind and last_index == index:
+                return data
+
+        start = index * self.__chunk
+        count = min(self.__chunk, self.__nsteps - start)
+        data = self.__file.read(f"{kind}/{index}.bin")
+        data = _decode_chunk(data, (count, self.__natoms, 3))
+        self.__last_chunk = (kind, index, data)
+        return data
+
+    def __read_data(self, kind, steps, out):
+        for i, step in enumerate(steps):
+            index, offset = divmod(step, self.__chunk)
+            out[i] = self.__chunk_data(kind, index)[offset]
+        return out
+
+    @property
+    def path(self):
+        """Get the path of the original trajectory file."""
+        return self.__path
+
+    @property
+    def nsteps(self):
+        """Get the number of steps in this trajectory."""
+        self.__check_opened()
+        return self.__nsteps
+
+    @property
+    def topology(self):
+        """
+        Get the read-only :py:class:`Topology` shared by all the steps of this
+        trajectory, with the same semantics as :py:func:`Trajectory.topology`.
+        """
+        self.__check_opened()
+        return self.__topology
+
+    def read(self):
+        """
+        Read the next step of this trajectory and return the corresponding
+        :py:class:`Frame`.
+        """
+        return self.read_step(self.__position)
+
+    def read_step(self, step):
+        """
+        Read a specific ``step`` in this trajectory and return the
+        corresponding :py:class:`Frame`. The next call to
+        :py:func:`CachedTrajectory.read` will read the following step.
+        """
+        self.__check_opened()
+        step = _normalize_step(step, self.__nsteps)
+
+        frame = Frame()
+        frame.resize(self.__natoms)
+        frame.topology = self.__topology
+        positions = frame.positions.reshape(-1, 3)
+        self.__read_data("positions", [step], positions[np.newaxis])
+        if self.__has_velocities:
+            frame.add_velocities()
+            velocities = frame.velocities.reshape(-1, 3)
+            self.__read_data("velocities", [step], velocities[np.newaxis])
+
+        cell = UnitCell(self.__cells[step])
+        cell.shape = CellShape(int(self.__shapes[step]))
+        frame.cell = cell
+        frame.step = int(self.__steps[step])
+
+        self.__position = step + 1
+        return frame
+
+    def read_positions(self, start=0, stop=None, stride=1, out=None, dtype=np.float64):
+        """
+        Read the positions of all atoms for the steps in ``range(start, stop,
+        stride)``, with the same semantics as
+        :py:func:`Trajectory.read_positions`.
+
+        Only the positions are decompressed, without creating any
+        :py:class:`Frame`.
+        """
+        self.__check_opened()
+        steps = _normalize_range(start, stop, stride, self.__nsteps)
+
+        shape = (len(steps), self.__natoms, 3)
+        if out is None:
+            out = np.empty(shape, dtype=dtype)
+        elif out.shape != shape:
+            raise ChemfilesError(
+                f"expected an array with shape {shape} for 'out', got {out.shape}"
+            )
+
+        return self.__read_data("positions", steps, out)
+
+    def close(self):
+        """Close this trajectory and the underlying cache file."""
+        self.__check_opened()
+        self.__closed = True
+        self.__last_chunk = None
+        self.__file.close()
+
+
+def _open_cache(path, metadata):
+    """
+    Open the cache file at ``path``, returning ``None`` if it does not exist,
+    or if it does not correspond to the original file ``metadata``.
+    """
+    try:
+        file = zipfile.ZipFile(path, "r")
+    except (OSError, zipfile.BadZipFile):
+        return None
+
+    try:
+        header = json.loads(file.read("header.json"))
+    except (KeyError, ValueError):
+        header = None
+
+    if (
+        not isinstance(header, dict)
+        or header.get("version") != _CACHE_VERSION
+        or header.get("source") != metadata
+    ):
+        file.close()
+        return None
+
+    return file
+
+
+def _write_cache(path, format, cache, chunk, metadata):
+    """Create the cache file at ``cache`` for the trajectory at ``path``"""
+    # write to a temporary file, and move it in place only once complete
+    temporary = f"{cache}.{os.getpid()}.tmp"
+    try:
+        with Trajectory(path, "r", format) as trajectory, zipfile.ZipFile(
+            temporary, "w", zipfile.ZIP_STORED
+        ) as file:
+            nsteps = trajectory.nsteps
+            steps = np.zeros(nsteps, dtype=np.uint64)
+            cells = np.zeros((nsteps, 3, 3), dtype=np.float64)
+            shapes = np.zeros(nsteps, dtype=np.int8)
+
+            natoms = 0
+            velocities = False
+            topology = _topology_to_json(Topology())
+            buffers = {}
+
+            frame = Frame()
+            for step in range(nsteps):
+                trajectory.read_step(step, frame)
+                if step == 0:
+                    natoms = len(frame.atoms)
+                    velocities = frame.has_velocities()
+                    topology = _topology_to_json(frame.topology)
+                    buffers["positions"] = np.empty((chunk, natoms, 3))
+                    if velocities:
+                        buffers["velocities"] = np.empty((chunk, natoms, 3))
+                elif len(frame.atoms) != natoms:
+                    raise ChemfilesError(
+                        f"step {step} contains {len(frame.atoms)} atoms, "
+                        f"expected {natoms}"
+                    )
+
+                steps[step] = frame.step
+                cell = frame.cell
+                cells[step] = cell.matrix
+                shapes[step] = cell.shape
+
+                index, offset = divmod(step, chunk)
+                buffers["positions"][offset] = frame.positions.reshape(-1, 3)
+                if velocities:
+                    if not frame.has_velocities():
+                        raise ChemfilesError(
+                            f"step {step} does not contain velocities, "
+                            "but the first step does"
+                        )
+                    buffers["velocities"][offset] = frame.velocities.reshape(-1, 3)
+
+                if offset == chunk - 1 or step == nsteps - 1:
+                    for kind, buffer in buffers.items():
+                        data = _encode_chunk(buffer[: offset + 1])
+                        file.writestr(f"{kind}/{index}.bin", data)
+
+            _write_array(file, "steps.npy", steps)
+            _write_array(file, "cells.npy", cells)
+            _write_array(file, "shapes.npy", shapes)
+            file.writestr("topology.json", json.dumps(topology))
+
+            header = {
+                "version": _CACHE_VERSION,
+                "source": metadata,
+                "nsteps": nsteps,
+                "natoms": natoms,
+                "chunk": chunk,
+                "velocities": velocities,
+            }
+            file.writestr("header.json", json.dumps(header))
+
+        os.replace(temporary, cache)
+    finally:
+        if os.path.exists(temporary):
+            os.unlink(temporary)
+
+
+def _encode_chunk(array):
+    """
+    Compress an array of float64 data with shape ``(nframes, natoms, 3)``.
+
+    The bits of each frame are XOR-ed with the previous frame, and the bytes
+    are shuffled to group together the bytes with the same significance.
+    Both operations put lots of similar bytes close together, helping zlib to
+    compress the data.
+    """
+    bits = np.ascontiguousarray(array, dtype=np.float64).view(np.uint64)
+    delta = bits.copy()
+    delta[1:] ^= bits[:-1]
+    shuffled = delta.view(np.uint8).reshape(-1, 8).T
+    return zlib.compress(shuffled.tobytes(), 1)
+
+
+def _decode_chunk(data, shape):
+    """Decompress data created by :py:func:`_encode_chunk`"""
+    shuffled = np.frombuffer(zlib.decompress(data), dtype=np.uint8)
+    delta = shuffled.reshape(8, -1).T.copy().view(np.uint64).reshape(shape)
+    bits = np.bitwise_xor.accumulate(delta, axis=0)
+    return bits.view(np.float64)
+
+
+def _write_array(file, name, array):
+    buffer = io.BytesIO()
+    np.save(buffer, array)
+    file.writestr(name, buffer.getvalue())
+
+
+def _read_array(file, name):
+    return np.load(io.BytesIO(file.read(name)))
+
+
+def _topology_to_json(topology):
+    """Convert the data in ``topology`` to a JSON-compatible dictionary"""
+    atoms = [[atom.name, atom.type, atom.mass, atom.charge] for atom in topology.atoms]
+
+    residues = []
+    for residue in topology.residues:
+        try:
+            resid = residue.id
+        except ChemfilesError:
+            resid = None
+        residues.append([residue.name, resid, [int(i) for i in residue.atoms]])
+
+    return {
+        "atoms": atoms,
+        "bonds": topology.bonds.tolist(),
+        "orders": [int(order) for order in topology.bonds_orders],
+        "residues": residues,
+    }
+
+
+def _topology_from_json(data):
+    """Create a :py:class:`Topology` from data created by
+    :py:func:`_topology_to_json`"""
+    topology = Topology()
+    for name, type, mass, charge in data["atoms"]:
+        atom = Atom(name, type)
+        atom.mass = mass
+        atom.charge = charge
+        topology.atoms.append(atom)
+
+    for (i, j), order in zip(data["bonds"], data["orders"]):
+        topology.add_bond(i, j, order)
+
+    for name, resid, atoms in data["residues"]:
+        residue = Residue(name, resid)
+        for i in atoms:
+            residue.atoms.append(i)
+        topology.residues.append(residue)
+
+    return topology
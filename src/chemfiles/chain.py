@@ -0,0 +1,177 @@
+import bisect
+import collections
+import copy
+from concurrent.futures import ThreadPoolExecutor
+
+from .misc import ChemfilesError
+from .topology import Topology
+from .trajectory import Trajectory, _index_trajectory, _normalize_step
+
+
+class ChainTrajectory(object):
+    """
+    A :py:class:`ChainTrajectory` presents multiple trajectory files (for
+    example the segments of a long simulation) as a single trajectory, where
+    the steps of each file follow the steps of the previous one.
+
+    Files are only opened when reading steps from them, and at most
+    ``max_open`` files are kept open at the same time, closing the least
+    recently used ones as needed.
+    """
+
+    def __init__(self, paths, format="", max_open=8, threads=None):
+        """
+        Create a new :py:class:`ChainTrajectory` reading the files at the given
+        ``paths``, in order, with the optional ``format``.
+
+        The number of steps in each file is computed the first time it is
+        needed, reading up to ``threads`` files in parallel (by default, this
+        uses the default number of threads of
+        :py:class:`concurrent.futures.ThreadPoolExecutor`).
+        """
+        if max_open < 1:
+            raise ChemfilesError(
+                f"'max_open' must be at least 1 in ChainTrajectory, got {max_open}"
+            )
+
+        self.__paths = list(paths)
+        self.__format = format
+        self.__max_open = max_open
+        self.__threads = threads
+        # first global step of each file, and total number of steps at the end
+        self.__offsets = None
+        # opened files, indexed by their position in self.__paths and sorted
+        # from least to most recently used
+        self.__opened = collections.OrderedDict()
+        self.__topology = None
+        self.__cell = None
+        self.__position = 0
+        self.__closed = False
+
+    def __check_opened(self):
+        if self.__closed:
+            raise ChemfilesError("Can not use a closed ChainTrajectory")
+
+    def __enter__(self):
+        self.__check_opened()
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self.nsteps
+
+    def __iter__(self):
+        self.__check_opened()
+        for step in range(self.nsteps):
+            yield self.read_step(step)
+
+    def __getitem__(self, index):
+        """
+        Get the :py:class:`Frame` at the given step ``index``, or a lazy
+        sequence of frames, with the same semantics as
+        :py:func:`Trajectory.__getitem__`.
+        """
+        self.__check_opened()
+        return _index_trajectory(self, index)
+
+    def __repr__(self):
+        return f"ChainTrajectory with {len(self.__paths)} files"
+
+    def __compute_offsets(self):
+        with ThreadPoolExecutor(self.__threads) as executor:
+            counts = executor.map(
+                _count_steps, self.__paths, [self.__format] * len(self.__paths)
+            )
+            counts = list(counts)
+
+        offsets = [0]
+        for count in counts:
+            offsets.append(offsets[-1] + count)
+        self.__offsets = offsets
+
+    def __file(self, index):
+        """Get the opened trajectory for the file at ``index``"""
+        trajectory = self.__opened.get(index)
+        if trajectory is not None:
+            self.__opened.move_to_end(index)
+            return trajectory
+
+        while len(self.__opened) >= self.__max_open:
+            _, oldest = self.__opened.popitem(last=False)
+            oldest.close()
+
+        trajectory = Trajectory(self.__paths[index], "r", self.__format)
+        if self.__topology is not None:
+            trajectory.set_topology(*self.__topology)
+        if self.__cell is not None:
+            trajectory.set_cell(self.__cell)
+
+        self.__opened[index] = trajectory
+        return trajectory
+
+    @property
+    def paths(self):
+        """Get the list of files in this :py:class:`ChainTrajectory`."""
+        return list(self.__paths)
+
+    @property
+    def nsteps(self):
+        """Get the total number of steps in all the files."""
+        self.__check_opened()
+        if self.__offsets is None:
+            self.__compute_offsets()
+        return self.__offsets[-1]
+
+    def read(self):
+        """
+        Read the next step of this :py:class:`ChainTrajectory` and return the
+        corresponding :py:class:`Frame`.
+        """
+        return self.read_step(self.__position)
+
+    def read_step(self, step):
+        """
+        Read a specific ``step`` in this :py:class:`ChainTrajectory` and return
+        the corresponding :py:class:`Frame`. The next call to
+        :py:func:`ChainTrajectory.read` will read the following step.
+        """
+        self.__check_opened()
+        step = _normalize_step(step, self.nsteps)
+        index = bisect.bisect_right(self.__offsets, step) - 1
+        frame = self.__file(index).read_step(step - self.__offsets[index])
+        self.__position = step + 1
+        return frame
+
+    def set_topology(self, topology, format=""):
+        """
+        Set the :py:class:`Topology` used when reading all the files, with the
+        same semantics as :py:func:`Trajectory.set_topology`.
+        """
+        self.__check_opened()
+        if isinstance(topology, Topology):
+            topology = copy.copy(topology)
+        self.__topology = (topology, format)
+        for trajectory in self.__opened.values():
+            trajectory.set_topology(topology, format)
+
+    def set_cell(self, cell):
+        """Set the :py:class:`UnitCell` used when reading all the files."""
+        self.__check_opened()
+        self.__cell = copy.copy(cell)
+        for trajectory in self.__opened.values():
+            trajectory.set_cell(cell)
+
+    def close(self):
+        """Close all the files opened by this :py:class:`ChainTrajectory`."""
+        self.__check_opened()
+        self.__closed = True
+        while self.__opened:
+            _, trajectory = self.__opened.popitem()
+            trajectory.close()
+
+
+def _count_steps(path, format):
+    with Trajectory(path, "r", format) as trajectory:
+        return trajectory.nsteps
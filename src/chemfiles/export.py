@@ -0,0 +1,110 @@
+import os
+
+import numpy as np
+
+from .frame import Frame
+from .misc import ChemfilesError
+from .trajectory import Trajectory
+
+_FIELDS = ("positions", "velocities", "cells")
+
+
+def export_npy(
+    path_in, path_out, fields=("positions", "velocities", "cells"), format=""
+):
+    """
+    Convert the trajectory at ``path_in`` (read with the optional ``format``)
+    to a directory of numpy ``.npy`` files at ``path_out``, which can then be
+    loaded as memory-mapped arrays with :py:func:`load_npy`.
+
+    The following ``fields`` can be exported, each one in a separate file:
+
+    - ``"positions"``: array with shape ``(nsteps, natoms, 3)``;
+    - ``"velocities"``: array with shape ``(nsteps, natoms, 3)``, only exported
+      if the first frame of the trajectory contains velocities;
+    - ``"cells"``: unit cell matrices, with shape ``(nsteps, 3, 3)``.
+
+    The step of each frame is always exported, in ``steps.npy``. The frames
+    are read one by one and written directly to the files, so the whole
+    trajectory never needs to fit in memory. All the frames must contain the
+    same number of atoms.
+    """
+    for field in fields:
+        if field not in _FIELDS:
+            raise ChemfilesError(f"unknown field '{field}' in export_npy")
+
+    os.makedirs(path_out, exist_ok=True)
+    with Trajectory(path_in, "r", format) as trajectory:
+        nsteps = trajectory.nsteps
+        if nsteps == 0:
+            arrays = _create_arrays(path_out, fields, None, 0, 0)
+
+        natoms = None
+        frame = Frame()
+        for step in range(nsteps):
+            trajectory.read_step(step, frame)
+            positions = frame.positions.reshape(-1, 3)
+            if natoms is None:
+                natoms = len(positions)
+                arrays = _create_arrays(path_out, fields, frame, nsteps, natoms)
+            elif len(positions) != natoms:
+                raise ChemfilesError(
+                    f"step {step} contains {len(positions)} atoms, "
+                    f"expected {natoms}"
+                )
+
+            arrays["steps"][step] = frame.step
+            if "positions" in arrays:
+                arrays["positions"][step] = positions
+            if "velocities" in arrays:
+                arrays["velocities"][step] = frame.velocities
+            if "cells" in arrays:
+                arrays["cells"][step] = frame.cell.matrix
+
+    for array in arrays.values():
+        array.flush()
+
+
+def load_npy(path, mode="r"):
+    """
+    Load the data exported by :py:func:`export_npy` at ``path`` as a
+    dictionary of memory-mapped numpy arrays, with the field names (and
+    ``"steps"``) as keys. The ``mode`` is used to open the arrays, see
+    :py:func:`numpy.load` for the possible values.
+    """
+    arrays = {}
+    for name in ("steps",) + _FIELDS:
+        file = os.path.join(path, name + ".npy")
+        if os.path.exists(file):
+            arrays[name] = np.load(file, mmap_mode=mode)
+
+    if "steps" not in arrays:
+        raise ChemfilesError(f"'{path}' does not contain data from export_npy")
+
+    return arrays
+
+
+def _create_arrays(path, fields, frame, nsteps, natoms):
+    """Create the memory-mapped arrays used to export ``fields``"""
+    if "velocities" in fields and frame is not None and not frame.has_velocities():
+        fields = [field for field in fields if field != "velocities"]
+
+    shapes = {
+        "positions": (nsteps, natoms, 3),
+        "velocities": (nsteps, natoms, 3),
+        "cells": (nsteps, 3, 3),
+    }
+
+    arrays = {}
+    for name in ("steps",) + _FIELDS:
+        file = os.path.join(path, name + ".npy")
+        if name == "steps":
+            arrays[name] = np.lib.format.open_memmap(file, "w+", np.uint64, (nsteps,))
+        elif name in fields:
+            arrays[name] = np.lib.format.open_memmap(
+                file, "w+", np.float64, shapes[name]
+            )
+        elif os.path.exists(file):
+            # remove data from a previous export in the same directory
+            os.unlink(file)
+    return arrays
@@ -3,7 +3,7 @@ from ctypes import POINTER, c_bool, c_char_p, c_double, c_uint64
 import numpy as np
 
 from ._c_api import chfl_bond_order, chfl_vector3d
-from .atom import Atom
+from .atom import Atom, _atom_repr, _AtomsArrays
 from .cell import UnitCell
 from .misc import ChemfilesError
 from .property import Property
@@ -11,7 +11,7 @@ from .topology import Topology
 from .utils import CxxPointer
 
 
-class FrameAtoms(object):
+class FrameAtoms(_AtomsArrays):
     """Proxy object to get the atoms in a frame"""
 
     def __init__(self, frame):
@@ -26,22 +26,108 @@ class FrameAtoms(object):
     def __getitem__(self, index):
         """
         Get a reference to the :py:class:`Atom` at the given ``index`` in the
-        associated :py:class:`Frame`.
+        associated :py:class:`Frame`. Negative indexes count from the end of
+        the frame, and if ``index`` is a slice, this returns a list of atoms.
         """
-        if index >= len(self):
-            raise IndexError(f"atom index ({index}) out of range for this frame")
+        count = len(self)
+        if isinstance(index, slice):
+            return [self.__atom(i) for i in range(*index.indices(count))]
+
+        if -count <= index < count:
+            return self.__atom(index % count)
         else:
-            ptr = self.frame.ffi.chfl_atom_from_frame(
-                self.frame.mut_ptr, c_uint64(index)
-            )
-            return Atom.from_mutable_ptr(self, ptr)
+            raise IndexError(f"atom index ({index}) out of range for this frame")
 
     def __iter__(self):
+        # only get the number of atoms once, __getitem__ would do it every time
         for i in range(len(self)):
-            yield self[i]
+            yield self.__atom(i)
+
+    def __repr__(self):
+        names = self.names
+        types = self.types
+        return "[" + ", ".join(map(_atom_repr, names, types)) + "]"
+
+    def __atom(self, index):
+        """Get the atom at ``index``, which must be in bounds"""
+        return Atom.from_mutable_ptr(self, self._atom_ptr(index, True))
+
+    def _atom_ptr(self, index, mutable):
+        frame = self.frame
+        ptr = frame.mut_ptr if mutable else frame.ptr
+        return frame.ffi.chfl_atom_from_frame(ptr, c_uint64(index))
+
+
+class FrameArray(object):
+    """
+    A :py:class:`FrameArray` gives access to the positions or velocities of
+    a :py:class:`Frame` without copying them, and stays valid if the frame is
+    resized or read into.
+
+    The underlying numpy array is available as :py:attr:`FrameArray.array`,
+    and a :py:class:`FrameArray` can also be indexed and used directly in
+    numpy functions. Each access checks whether the frame changed since the
+    array was created, and either gets a new array from the frame or raises a
+    :py:class:`ChemfilesError`, depending on the ``refresh`` parameter used to
+    create this :py:class:`FrameArray`.
+
+    .. code-block:: python
+
+        positions = frame.positions_view()
+        frame.add_atom(Atom("Zn"), [0, 0, 0])
+        # this would be unsafe with frame.positions
+        positions[-1] = [1, 2, 3]
+    """
+
+    def __init__(self, frame, name, refresh=True):
+        self.__frame = frame
+        self.__name = name
+        self.__refresh = refresh
+        self.__generation = frame._generation
+        self.__array = getattr(frame, name)
 
     def __repr__(self):
-        return "[" + ", ".join([atom.__repr__() for atom in self]) + "]"
+        return f"FrameArray({self.array!r})"
+
+    def __len__(self):
+        return len(self.array)
+
+    def __getitem__(self, index):
+        return self.array[index]
+
+    def __setitem__(self, index, value):
+        self.array[index] = value
+
+    def __array__(self, dtype=None, copy=None):
+        array = self.array
+        if dtype is not None and np.dtype(dtype) != array.dtype:
+            return array.astype(dtype)
+        elif copy:
+            return array.copy()
+        else:
+            return array
+
+    @property
+    def shape(self):
+        """Get the shape of the underlying array"""
+        return self.array.shape
+
+    @property
+    def array(self):
+        """
+        Get the underlying numpy array, which is only valid until the next
+        change to the frame size.
+        """
+        generation = self.__frame._generation
+        if generation != self.__generation:
+            if not self.__refresh:
+                raise ChemfilesError(
+                    f"the {self.__name} of this frame were invalidated by a "
+                    "change to the frame"
+                )
+            self.__array = getattr(self.__frame, self.__name)
+            self.__generation = generation
+        return self.__array
 
 
 class Frame(CxxPointer):
@@ -52,6 +138,10 @@ class Frame(CxxPointer):
     cell), the corresponding data is filled with a default value.
     """
 
+    # Incremented every time the positions and velocities arrays may be
+    # re-allocated, used by FrameArray to detect invalidated arrays
+    _generation = 0
+
     def __init__(self):
         """
         Create an empty :py:class:`Frame` that will be resized by the runtime
@@ -80,6 +170,7 @@ class Frame(CxxPointer):
         absence of velocities.
         """
         self.ffi.chfl_frame_resize(self.mut_ptr, c_uint64(count))
+        self._generation += 1
 
     def add_atom(self, atom, position, velocity=None):
         """
@@ -93,6 +184,7 @@ class Frame(CxxPointer):
         if velocity:
             velocity = chfl_vector3d(velocity[0], velocity[1], velocity[2])
         self.ffi.chfl_frame_add_atom(self.mut_ptr, atom.ptr, position, velocity)
+        self._generation += 1
 
     def remove(self, index):
         """
@@ -103,6 +195,7 @@ class Frame(CxxPointer):
         :py:func:`Frame.positions` or :py:func:`Frame.velocities`.
         """
         self.ffi.chfl_frame_remove(self.mut_ptr, c_uint64(index))
+        self._generation += 1
 
     def add_bond(self, i, j, order=None):
         """
@@ -153,7 +246,8 @@ class Frame(CxxPointer):
         If the frame is resized (by writing to it, calling
         :py:func:`Frame.resize`, :py:func:`Frame.add_atom`,
         :py:func:`Frame.remove`), the array is invalidated. Accessing it can
-        cause a segfault.
+        cause a segfault. Use :py:func:`Frame.positions_view` to get an array
+        that stays valid in this case.
         """
         count = c_uint64()
         data = POINTER(chfl_vector3d)()
@@ -176,7 +270,8 @@ class Frame(CxxPointer):
         If the frame is resized (by writing to it, calling
         :py:func:`Frame.resize`, :py:func:`Frame.add_atom`,
         :py:func:`Frame.remove`), the array is invalidated. Accessing it can
-        cause a segfault.
+        cause a segfault. Use :py:func:`Frame.velocities_view` to get an array
+        that stays valid in this case.
         """
         count = c_uint64()
         data = POINTER(chfl_vector3d)()
@@ -188,6 +283,45 @@ class Frame(CxxPointer):
         else:
             return np.array([[], [], []], dtype=np.float64)
 
+    def positions_view(self, refresh=True):
+        """
+        Get a :py:class:`FrameArray` giving safe access to the positions of
+        this :py:class:`Frame`, even after the frame is resized.
+
+        If ``refresh`` is ``True``, the array is transparently fetched again
+        when the frame was resized. Otherwise, using the array after the frame
+        was resized raises a :py:class:`ChemfilesError`.
+        """
+        return FrameArray(self, "positions", refresh)
+
+    def velocities_view(self, refresh=True):
+        """
+        Get a :py:class:`FrameArray` giving safe access to the velocities of
+        this :py:class:`Frame`, with the same semantics as
+        :py:func:`Frame.positions_view`.
+        """
+        return FrameArray(self, "velocities", refresh)
+
+    def positions_as(self, dtype, out=None):
+        """
+        Get a copy of the positions of this :py:class:`Frame`, converted to
+        the given ``dtype``.
+
+        If ``out`` is given, it must be an array with shape ``(natoms, 3)`` and
+        the given ``dtype``, and the positions are converted directly into it.
+        The conversion and copy happen in a single pass, without creating an
+        intermediary array.
+        """
+        return _convert_array(self.positions, dtype, out)
+
+    def velocities_as(self, dtype, out=None):
+        """
+        Get a copy of the velocities of this :py:class:`Frame`, converted to
+        the given ``dtype``, with the same semantics as
+        :py:func:`Frame.positions_as`.
+        """
+        return _convert_array(self.velocities, dtype, out)
+
     def add_velocities(self):
         """
         Add velocity data to this :py:class:`Frame`.
@@ -196,6 +330,7 @@ class Frame(CxxPointer):
         velocities, this function does nothing.
         """
         self.ffi.chfl_frame_add_velocities(self.mut_ptr)
+        self._generation += 1
 
     def has_velocities(self):
         """Check if this :py:class:`Frame` contains velocity."""
@@ -352,3 +487,21 @@ class Frame(CxxPointer):
         names = StringArray()
         self.ffi.chfl_frame_list_properties(self.ptr, names, count)
         return list(map(lambda n: n.decode("utf8"), names))
+
+
+def _convert_array(array, dtype, out):
+    array = array.reshape(-1, 3)
+    if out is None:
+        return np.array(array, dtype=dtype)
+
+    if out.dtype != np.dtype(dtype):
+        raise ChemfilesError(
+            f"expected an array with {np.dtype(dtype)} dtype for 'out', got {out.dtype}"
+        )
+    if out.shape != array.shape:
+        raise ChemfilesError(
+            f"expected an array with shape {array.shape} for 'out', got {out.shape}"
+        )
+
+    np.copyto(out, array, casting="unsafe")
+    return out
@@ -0,0 +1,66 @@
+import functools
+import itertools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .trajectory import Trajectory
+
+
+def map_frames(path, function, reduce=None, workers=None, chunk=None, format=""):
+    """
+    Call ``function(frame)`` on every :py:class:`Frame` of the trajectory at
+    ``path``, using ``workers`` processes (by default, one per CPU).
+
+    The steps are split in chunks of ``chunk`` consecutive steps, and each
+    worker process opens its own :py:class:`Trajectory` with the given
+    ``format`` to read them. ``function`` (and ``reduce``) must be picklable,
+    i.e. defined at the top level of a module.
+
+    If ``reduce`` is ``None``, this function returns the list of all results,
+    in the same order as the steps. Otherwise, ``reduce(a, b)`` is used to
+    combine the results, first inside each chunk and then across chunks, and
+    the final value is returned (``None`` if the trajectory is empty).
+    """
+    with Trajectory(path, "r", format) as trajectory:
+        nsteps = trajectory.nsteps
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if chunk is None:
+        # use a few chunks per worker to balance the load between workers
+        chunk = max(1, math.ceil(nsteps / (4 * workers)))
+
+    with ProcessPoolExecutor(workers) as executor:
+        futures = [
+            executor.submit(
+                _map_chunk,
+                path,
+                format,
+                start,
+                min(start + chunk, nsteps),
+                function,
+                reduce,
+            )
+            for start in range(0, nsteps, chunk)
+        ]
+        partials = [future.result() for future in futures]
+
+    if reduce is None:
+        return list(itertools.chain.from_iterable(partials))
+    elif len(partials) == 0:
+        return None
+    else:
+        return functools.reduce(reduce, partials)
+
+
+def _map_chunk(path, format, start, stop, function, reduce):
+    """Apply ``function`` to the steps in ``range(start, stop)`` of a file"""
+    with Trajectory(path, "r", format) as trajectory:
+        results = (trajectory.read_step(step) for step in range(start, stop))
+        results = map(function, results)
+        if reduce is None:
+            return list(results)
+        else:
+            return functools.reduce(reduce, results)
@@ -0,0 +1,105 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from .misc import ChemfilesError
+from .trajectory import Trajectory
+from .utils import _END, _BoundedProducer
+
+
+def convert(
+    input,
+    output,
+    transforms=(),
+    threads=None,
+    input_format="",
+    output_format="",
+    buffer=16,
+    progress=None,
+):
+    """
+    Convert the trajectory at ``input`` to ``output``, optionally applying
+    ``transforms`` to each :py:class:`Frame` on the way, and return the
+    number of steps written.
+
+    The conversion runs as a pipeline of three stages connected by bounded
+    queues: the input file is read on a background thread, the transforms are
+    applied by a pool of ``threads`` worker threads (by default, the default
+    number of threads of :py:class:`concurrent.futures.ThreadPoolExecutor`),
+    and the frames are written in the output file by the calling thread. The
+    C library is called without holding the GIL, so reading, writing and
+    transforms using chemfiles functions run in parallel. At most ``buffer``
+    frames are kept in memory at any time, and the steps are always written
+    in the same order as they are read.
+
+    Each transform is a function called as ``transform(frame)``, and should
+    return the :py:class:`Frame` to pass to the next transform (either a new
+    frame or the same one after modifying it), or ``None`` to skip this step
+    in the output. Transforms may be called for different frames concurrently
+    from multiple threads.
+
+    If given, ``input_format`` and ``output_format`` are used as the file
+    formats instead of guessing them from the file extensions; and
+    ``progress(written, total)`` is called by the calling thread after each
+    step is processed.
+
+    .. code-block:: python
+
+        def remove_hydrogens(frame):
+            selection = Selection("type H")
+            for i in reversed(selection.evaluate(frame)):
+                frame.remove(i)
+            return frame
+
+        convert("input.arc", "output.pdb", transforms=[remove_hydrogens])
+    """
+    if buffer < 1:
+        raise ChemfilesError(f"'buffer' must be at least 1 in convert, got {buffer}")
+    if threads is not None and threads < 1:
+        raise ChemfilesError(f"'threads' must be at least 1 in convert, got {threads}")
+
+    transforms = list(transforms)
+    with Trajectory(input, "r", input_format) as reader:
+        total = reader.nsteps
+        with Trajectory(output, "w", output_format) as writer:
+            with ThreadPoolExecutor(threads) as executor:
+                return _run_pipeline(
+                    reader, writer, executor, transforms, total, buffer, progress
+                )
+
+
+def _run_pipeline(reader, writer, executor, transforms, total, buffer, progress):
+    # futures for transformed frames, in the same order as the steps
+    futures = _BoundedProducer(
+        (
+            executor.submit(_apply_transforms, transforms, reader.read())
+            for _ in range(total)
+        ),
+        buffer,
+    )
+
+    processed = 0
+    written = 0
+    try:
+        while True:
+            future = futures.get()
+            if future is _END:
+                return written
+
+            frame = future.result()
+            if frame is not None:
+                writer.write(frame)
+                written += 1
+
+            processed += 1
+            if progress is not None:
+                progress(processed, total)
+    finally:
+        for future in futures.stop():
+            future.cancel()
+
+
+def _apply_transforms(transforms, frame):
+    for transform in transforms:
+        frame = transform(frame)
+        if frame is None:
+            return None
+    return frame
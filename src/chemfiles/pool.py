@@ -0,0 +1,144 @@
+import collections
+import contextlib
+import os
+import threading
+
+from .misc import ChemfilesError
+from .trajectory import Trajectory
+
+
+class TrajectoryPool(object):
+    """
+    A :py:class:`TrajectoryPool` keeps a cache of opened read-mode
+    :py:class:`Trajectory`, to avoid re-opening the same files many times.
+
+    At most ``max_open`` trajectories are kept open, and the least recently
+    used ones are closed when needed. The pool can be used from multiple
+    threads, and each trajectory is only used by one thread at the time.
+
+    .. code-block:: python
+
+        pool = TrajectoryPool(max_open=64)
+        with pool.open("water.xyz") as trajectory:
+            frame = trajectory.read_step(42)
+    """
+
+    def __init__(self, max_open=16):
+        """
+        Create a new :py:class:`TrajectoryPool` keeping at most ``max_open``
+        trajectories open.
+        """
+        if max_open < 1:
+            raise ChemfilesError(
+                f"'max_open' must be at least 1 in TrajectoryPool, got {max_open}"
+            )
+
+        self.__max_open = max_open
+        # protects self.__entries and self.__closed
+        self.__lock = threading.Lock()
+        # (path, format) => _PoolEntry, from least to most recently used
+        self.__entries = collections.OrderedDict()
+        self.__closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        """Get the number of currently opened trajectories in this pool"""
+        with self.__lock:
+            return len(self.__entries)
+
+    def __repr__(self):
+        return f"TrajectoryPool(max_open={self.__max_open})"
+
+    @contextlib.contextmanager
+    def open(self, path, format=""):
+        """
+        Get exclusive access to the :py:class:`Trajectory` reading the file at
+        ``path`` with the given ``format``, opening it if needed. This function
+        should be used in a ``with`` block, and the trajectory must not be used
+        or closed after the end of the block.
+        """
+        key = (os.path.abspath(path), format)
+        entry = self.__acquire(key)
+        try:
+            if entry.trajectory is None:
+                entry.trajectory = Trajectory(path, "r", format)
+            yield entry.trajectory
+        finally:
+            self.__release(key, entry)
+
+    def __acquire(self, key):
+        with self.__lock:
+            if self.__closed:
+                raise ChemfilesError("Can not use a closed TrajectoryPool")
+
+            entry = self.__entries.get(key)
+            if entry is None:
+                entry = _PoolEntry()
+                self.__entries[key] = entry
+                self.__evict()
+            else:
+                self.__entries.move_to_end(key)
+            entry.users += 1
+
+        entry.lock.acquire()
+        return entry
+
+    def __release(self, key, entry):
+        entry.lock.release()
+        with self.__lock:
+            entry.users -= 1
+            if entry.trajectory is None and entry.users == 0:
+                # opening the file failed, don't keep the entry around
+                if self.__entries.get(key) is entry:
+                    del self.__entries[key]
+            elif self.__closed and entry.users == 0:
+                entry.close()
+            else:
+                self.__evict()
+
+    def __evict(self):
+        """Close least recently used trajectories, must hold self.__lock"""
+        if len(self.__entries) <= self.__max_open:
+            return
+
+        for key in list(self.__entries.keys()):
+            entry = self.__entries[key]
+            if entry.users == 0:
+                del self.__entries[key]
+                entry.close()
+                if len(self.__entries) <= self.__max_open:
+                    return
+
+    def close(self):
+        """
+        Close all the trajectories in this pool. Trajectories currently in use
+        are closed when they are released.
+        """
+        with self.__lock:
+            self.__closed = True
+            entries = list(self.__entries.values())
+            self.__entries.clear()
+            for entry in entries:
+                if entry.users == 0:
+                    entry.close()
+
+
+class _PoolEntry(object):
+    """A trajectory in a pool, with the lock protecting it"""
+
+    def __init__(self):
+        self.trajectory = None
+        # re-entrant to allow nested ``pool.open`` of the same file in a thread
+        self.lock = threading.RLock()
+        # number of threads using or waiting for this entry
+        self.users = 0
+
+    def close(self):
+        if self.trajectory is not None:
+            self.trajectory.close()
+            self.trajectory = None
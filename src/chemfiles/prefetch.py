@@ -0,0 +1,102 @@
+from .misc import ChemfilesError
+from .utils import _END, _BoundedProducer
+
+
+class PrefetchingTrajectory(object):
+    """
+    A :py:class:`PrefetchingTrajectory` reads the frames of a
+    :py:class:`Trajectory` on a background thread, while the previous frames
+    are being used by the main thread.
+
+    The C library is called without holding the GIL, so parsing the next
+    frames happens in parallel with the Python code analysing the current one.
+    """
+
+    # Set in __init__, defined here for __del__ if __init__ fails
+    __closed = True
+
+    def __init__(self, trajectory, prefetch=4, steps=None):
+        """
+        Start reading the given ``steps`` (all the steps by default) of
+        ``trajectory`` in the background, keeping at most ``prefetch`` frames
+        in memory before they are used.
+
+        The ``trajectory`` must not be used directly while this
+        :py:class:`PrefetchingTrajectory` exists, and is closed with it.
+        """
+        if prefetch < 1:
+            raise ChemfilesError(
+                f"'prefetch' must be at least 1 in PrefetchingTrajectory, "
+                f"got {prefetch}"
+            )
+
+        if steps is None:
+            steps = range(trajectory.nsteps)
+
+        self.__trajectory = trajectory
+        self.__steps = steps
+        self.__closed = False
+        self.__frames = _BoundedProducer(
+            (trajectory.read_step(step) for step in steps), prefetch
+        )
+
+    def __check_opened(self):
+        if self.__closed:
+            raise ChemfilesError("Can not use a closed PrefetchingTrajectory")
+
+    def __del__(self):
+        if not self.__closed:
+            self.close()
+
+    def __enter__(self):
+        self.__check_opened()
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return len(self.__steps)
+
+    def __iter__(self):
+        self.__check_opened()
+        while True:
+            frame = self.__next_frame()
+            if frame is None:
+                return
+            yield frame
+
+    def __repr__(self):
+        return f"PrefetchingTrajectory({self.__trajectory!r})"
+
+    def __next_frame(self):
+        frame = self.__frames.get()
+        if frame is _END:
+            return None
+        return frame
+
+    @property
+    def nsteps(self):
+        """Get the number of steps read by this :py:class:`PrefetchingTrajectory`"""
+        return len(self.__steps)
+
+    def read(self):
+        """
+        Get the next :py:class:`Frame` read by the background thread, waiting
+        for it if it is not yet available.
+        """
+        self.__check_opened()
+        frame = self.__next_frame()
+        if frame is None:
+            raise ChemfilesError("no more steps to read in PrefetchingTrajectory")
+        return frame
+
+    def close(self):
+        """
+        Stop the background thread, and close the underlying
+        :py:class:`Trajectory`.
+        """
+        self.__check_opened()
+        self.__closed = True
+        self.__frames.stop()
+        self.__trajectory.close()
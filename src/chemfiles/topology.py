@@ -4,7 +4,7 @@ from enum import IntEnum
 import numpy as np
 
 from ._c_api import chfl_bond_order
-from .atom import Atom
+from .atom import Atom, _atom_repr, _AtomsArrays
 from .residue import Residue
 from .utils import CxxPointer
 
@@ -33,7 +33,7 @@ class BondOrder(IntEnum):
     Aromatic = chfl_bond_order.CHFL_BOND_AROMATIC
 
 
-class TopologyAtoms(object):
+class TopologyAtoms(_AtomsArrays):
     """Proxy object to get the atoms in a topology"""
 
     def __init__(self, topology):
@@ -48,25 +48,40 @@ class TopologyAtoms(object):
     def __getitem__(self, index):
         """
         Get a reference to the :py:class:`Atom` at the given ``index`` in the
-        associated :py:class:`Topology`.
+        associated :py:class:`Topology`. Negative indexes count from the end
+        of the topology, and if ``index`` is a slice, this returns a list of
+        atoms.
         """
-        if index >= len(self):
-            raise IndexError(f"atom index ({index}) out of range for this topology")
+        count = len(self)
+        if isinstance(index, slice):
+            return [self.__atom(i) for i in range(*index.indices(count))]
+
+        if -count <= index < count:
+            return self.__atom(index % count)
         else:
-            ptr = self.topology.ffi.chfl_atom_from_topology(
-                self.topology.mut_ptr, c_uint64(index)
-            )
-            return Atom.from_mutable_ptr(self, ptr)
+            raise IndexError(f"atom index ({index}) out of range for this topology")
 
     def __iter__(self):
+        # only get the number of atoms once, __getitem__ would do it every time
         for i in range(len(self)):
-            yield self[i]
+            yield self.__atom(i)
 
     def __delitem__(self, index):
         self.remove(index)
 
     def __repr__(self):
-        return "[" + ", ".join([atom.__repr__() for atom in self]) + "]"
+        names = self.names
+        types = self.types
+        return "[" + ", ".join(map(_atom_repr, names, types)) + "]"
+
+    def __atom(self, index):
+        """Get the atom at ``index``, which must be in bounds"""
+        if self.topology._CxxPointer__is_const:
+            ptr = self._atom_ptr(index, False)
+            read_only = self.topology._CxxPointer__read_only
+            return Atom.from_const_ptr(self, ptr, read_only)
+        else:
+            return Atom.from_mutable_ptr(self, self._atom_ptr(index, True))
 
     def remove(self, index):
         """
@@ -85,6 +100,11 @@ class TopologyAtoms(object):
         """
         self.topology.ffi.chfl_topology_add_atom(self.topology.mut_ptr, atom.ptr)
 
+    def _atom_ptr(self, index, mutable):
+        topology = self.topology
+        ptr = topology.mut_ptr if mutable else topology.ptr
+        return topology.ffi.chfl_atom_from_topology(ptr, c_uint64(index))
+
 
 class TopologyResidues(object):
     """Proxy object to get the residues in a topology"""
@@ -110,7 +130,8 @@ class TopologyResidues(object):
             ptr = self.topology.ffi.chfl_residue_from_topology(
                 self.topology.ptr, c_uint64(index)
             )
-            return Residue.from_const_ptr(self, ptr)
+            read_only = self.topology._CxxPointer__read_only
+            return Residue.from_const_ptr(self, ptr, read_only)
 
     def __iter__(self):
         for i in range(len(self)):
@@ -153,7 +174,7 @@ class Topology(CxxPointer):
 
         # if the topology comes from a frame, allow accessing atoms as
         # frame.topology.atoms anyway
-        if self._CxxPointer__is_const:
+        if self._CxxPointer__is_const and self._CxxPointer__origin is not None:
             return FrameAtoms(self._CxxPointer__origin)
         else:
             return TopologyAtoms(self)
@@ -183,7 +204,7 @@ class Topology(CxxPointer):
 
         ptr = self.ffi.chfl_residue_for_atom(self.ptr, c_uint64(index))
         if ptr:
-            return Residue.from_const_ptr(self, ptr)
+            return Residue.from_const_ptr(self, ptr, self._CxxPointer__read_only)
         else:
             return None
 
@@ -1,13 +1,103 @@
-from ctypes import c_char_p, c_uint64
-
+import bisect
+import copy
+import json
+import numbers
+import operator
+import os
+import warnings
+from collections import Counter
+from ctypes import ARRAY, c_char_p, c_uint8, c_uint64, c_void_p, cast, string_at
+
+import numpy as np
+
+from ._c_api import chfl_vector3d
 from .frame import Frame, Topology
-from .misc import ChemfilesError
-from .utils import CxxPointer, _call_with_growing_buffer
+from .misc import ChemfilesError, ChemfilesWarning
+from .utils import CxxPointer, _call_with_growing_buffer, _check_handle
+
+# Maximal number of frames read ahead of time when iterating over a
+# TrajectorySlice with unsorted steps
+_MAX_READ_AHEAD = 16
+
+
+class TrajectorySlice(object):
+    """
+    Lazy sequence of the frames at some steps of a trajectory, created by
+    indexing a :py:class:`Trajectory` with a slice or a list of steps.
+    Frames are only read when accessing or iterating over this sequence.
+    """
+
+    def __init__(self, trajectory, steps):
+        self.trajectory = trajectory
+        self.steps = steps
+
+    def __len__(self):
+        return len(self.steps)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return TrajectorySlice(self.trajectory, self.steps[index])
+        else:
+            return self.trajectory.read_step(self.steps[index])
+
+    def __iter__(self):
+        steps = self.steps
+        read_step = self.trajectory.read_step
+        if isinstance(steps, range):
+            # increasing ranges are read sequentially, and decreasing ones
+            # one step at the time without keeping frames around
+            for step in steps:
+                yield read_step(step)
+            return
+
+        # Steps are read in increasing order when possible, to prevent seeking
+        # backward in sequential formats. Frames read ahead of time are kept
+        # until they are needed, but at most _MAX_READ_AHEAD of them: steps
+        # further ahead are read directly when they are needed.
+        remaining = Counter(steps)
+        to_read = sorted(remaining)
+        next_index = 0
+        pending = {}
+        for step in steps:
+            remaining[step] -= 1
+            if step not in pending:
+                index = bisect.bisect_left(to_read, step, next_index)
+                found = index < len(to_read) and to_read[index] == step
+                if found and len(pending) + index - next_index < _MAX_READ_AHEAD:
+                    for next_step in to_read[next_index : index + 1]:
+                        # skip steps that were already read directly
+                        if next_step == step or remaining[next_step] > 0:
+                            pending[next_step] = read_step(next_step)
+                    next_index = index + 1
+                else:
+                    yield read_step(step)
+                    continue
+
+            if remaining[step] == 0:
+                yield pending.pop(step)
+            else:
+                yield copy.copy(pending[step])
+
+    def __repr__(self):
+        return f"TrajectorySlice with {len(self.steps)} steps"
 
 
 class BaseTrajectory(CxxPointer):
-    def __init__(self, ptr):
+    # Set in __init__, defined here for __del__ if __init__ fails
+    __closed = True
+
+    def __init__(self, ptr, nsteps=None, mode="r"):
         self.__closed = False
+        self.__mode = mode
+        # cached number of steps, reset when writing or in refresh()
+        self.__nsteps = nsteps
+        # topology and cell given to set_topology/set_cell, used by clones
+        self.__topology = None
+        self.__cell = None
+        # read-only topology shared by all steps, see the topology property
+        self.__shared_topology = None
+        # frame re-used by read_fields
+        self.__fields_frame = None
         super(BaseTrajectory, self).__init__(ptr, is_const=False)
 
     def __check_opened(self):
@@ -30,31 +120,220 @@ class BaseTrajectory(CxxPointer):
         for step in range(self.nsteps):
             yield self.read_step(step)
 
-    def read(self):
+    def __len__(self):
+        return self.nsteps
+
+    def __bool__(self):
+        # trajectories are always true, even when empty. Without this, Python
+        # would use __len__ which can require reading the whole file
+        return True
+
+    def __getitem__(self, index):
+        """
+        Get the :py:class:`Frame` at the given step ``index``, or a lazy
+        :py:class:`TrajectorySlice` over the selected steps if ``index`` is a
+        slice (``trajectory[1000:5000:10]``) or a list of steps
+        (``trajectory[[5, 17, 900]]``). Negative indexes count from the end of
+        the trajectory.
+        """
+        self.__check_opened()
+        return _index_trajectory(self, index)
+
+    def read(self, frame=None):
         """
         Read the next step of this :py:class:`Trajectory` and return the
         corresponding :py:class:`Frame`.
+
+        If ``frame`` is given, the data is read into this existing
+        :py:class:`Frame` instead of allocating a new one, and the same
+        ``frame`` is returned. This removes the per-step allocation when
+        iterating over a trajectory. Any array previously obtained with
+        :py:func:`Frame.positions` or :py:func:`Frame.velocities` is
+        invalidated by this call.
         """
         self.__check_opened()
-        frame = Frame()
+        if frame is None:
+            frame = Frame()
+        # the positions and velocities of frame can be re-allocated
+        frame._generation += 1
         self.ffi.chfl_trajectory_read(self.mut_ptr, frame.mut_ptr)
         return frame
 
-    def read_step(self, step):
+    def read_step(self, step, frame=None):
         """
         Read a specific ``step`` in this :py:class:`Trajectory` and return the
         corresponding :py:class:`Frame`.
+
+        If ``frame`` is given, the data is read into this existing
+        :py:class:`Frame` instead of allocating a new one, with the same
+        semantics as in :py:func:`Trajectory.read`.
         """
         self.__check_opened()
-        frame = Frame()
+        if frame is None:
+            frame = Frame()
+        # the positions and velocities of frame can be re-allocated
+        frame._generation += 1
         self.ffi.chfl_trajectory_read_step(self.mut_ptr, c_uint64(step), frame.mut_ptr)
         return frame
 
+    def read_fields(self, fields=("positions",), step=None):
+        """
+        Read the next step (or the given ``step``) of this
+        :py:class:`Trajectory` and return only the requested ``fields`` as a
+        dictionary, instead of a full :py:class:`Frame`. The possible fields
+        are:
+
+        - ``"positions"``: a numpy array with shape ``(natoms, 3)``;
+        - ``"velocities"``: a numpy array with shape ``(natoms, 3)``, or
+          ``None`` if this step does not contain velocities;
+        - ``"cell"``: the unit cell matrix, as a 3x3 numpy array;
+        - ``"step"``: the step of the frame, as an integer.
+
+        The data is read in a :py:class:`Frame` re-used between calls, and the
+        requested fields are copied out of it without creating any
+        :py:class:`Topology`, :py:class:`UnitCell` or :py:class:`Atom`. Note
+        that the file format is still fully parsed by chemfiles, including
+        the topology.
+        """
+        self.__check_opened()
+        for field in fields:
+            if field not in _READ_FIELDS:
+                raise ChemfilesError(f"unknown field '{field}' in read_fields")
+
+        if self.__fields_frame is None:
+            self.__fields_frame = Frame()
+        frame = self.__fields_frame
+
+        if step is None:
+            self.read(frame)
+        else:
+            self.read_step(step, frame)
+
+        ffi = self.ffi
+        data = {}
+        if "positions" in fields:
+            data["positions"] = frame.positions.copy()
+        if "velocities" in fields:
+            if frame.has_velocities():
+                data["velocities"] = frame.velocities.copy()
+            else:
+                data["velocities"] = None
+        if "cell" in fields:
+            matrix = ARRAY(chfl_vector3d, 3)()
+            cell = ffi.chfl_cell_from_frame(frame.ptr)
+            try:
+                ffi.chfl_cell_matrix(cell, matrix)
+            finally:
+                ffi.chfl_free(cell)
+            data["cell"] = np.array([list(row) for row in matrix])
+        if "step" in fields:
+            value = c_uint64()
+            ffi.chfl_frame_step(frame.ptr, value)
+            data["step"] = value.value
+        return data
+
+    def read_positions(self, start=0, stop=None, stride=1, out=None, dtype=np.float64):
+        """
+        Read the positions of all the steps in ``range(start, stop, stride)``
+        of this :py:class:`Trajectory` into a single numpy array with shape
+        ``(nframes, natoms, 3)``. If ``stop`` is ``None``, the positions are
+        read until the end of the trajectory. Negative ``start`` and ``stop``
+        count from the end of the trajectory, and all the steps in the range
+        must exist in the trajectory.
+
+        The positions are read without creating a :py:class:`Frame` for each
+        step. If ``out`` is given, it must be an array with the right shape, and
+        the positions will be written into it. Otherwise a new array with the
+        given ``dtype`` is allocated. All the steps must contain the same number
+        of atoms.
+        """
+        self.__check_opened()
+        steps = _normalize_range(start, stop, stride, self.nsteps)
+
+        if out is not None and (len(out.shape) != 3 or out.shape[0] != len(steps)):
+            raise ChemfilesError(
+                f"expected an array with shape ({len(steps)}, natoms, 3) for "
+                f"'out', got {out.shape}"
+            )
+
+        frame = Frame()
+        for i, step in enumerate(steps):
+            self.read_step(step, frame)
+            positions = frame.positions.reshape(-1, 3)
+            if out is None:
+                out = np.empty((len(steps), len(positions), 3), dtype=dtype)
+            elif out.shape[1:] != positions.shape:
+                raise ChemfilesError(
+                    f"step {step} contains {len(positions)} atoms, "
+                    f"expected {out.shape[1]}"
+                )
+            out[i] = positions
+
+        if out is None:
+            out = np.empty((0, 0, 3), dtype=dtype)
+        return out
+
     def write(self, frame):
         """Write a :py:class:`Frame` to this :py:class:`Trajectory`."""
         self.__check_opened()
+        self.__nsteps = None
         self.ffi.chfl_trajectory_write(self.mut_ptr, frame.ptr)
 
+    def write_positions(
+        self, positions, topology=None, cell=None, steps=None, velocities=None
+    ):
+        """
+        Write one step to this :py:class:`Trajectory` for each entry in the
+        ``positions`` array with shape ``(nframes, natoms, 3)``.
+
+        A single :py:class:`Frame` is re-used for all the steps. If given,
+        ``topology`` and ``cell`` are used for all the steps; and
+        ``velocities`` must have the same shape as ``positions``. ``steps``
+        contains the step number of each frame, and defaults to the index of
+        the frame in ``positions``.
+        """
+        self.__check_opened()
+        positions = np.asarray(positions)
+        if len(positions.shape) != 3 or positions.shape[2] != 3:
+            raise ChemfilesError(
+                "expected an array with shape (nframes, natoms, 3) for "
+                f"'positions', got {positions.shape}"
+            )
+        nframes, natoms, _ = positions.shape
+
+        if steps is None:
+            steps = range(nframes)
+        elif len(steps) != nframes:
+            raise ChemfilesError(
+                f"expected {nframes} values for 'steps', got {len(steps)}"
+            )
+
+        if velocities is not None:
+            velocities = np.asarray(velocities)
+            if velocities.shape != positions.shape:
+                raise ChemfilesError(
+                    f"expected an array with shape {positions.shape} for "
+                    f"'velocities', got {velocities.shape}"
+                )
+
+        frame = Frame()
+        frame.resize(natoms)
+        if topology is not None:
+            frame.topology = topology
+        if cell is not None:
+            frame.cell = cell
+        if velocities is not None:
+            frame.add_velocities()
+            frame_velocities = frame.velocities.reshape(-1, 3)
+        frame_positions = frame.positions.reshape(-1, 3)
+
+        for i in range(nframes):
+            frame_positions[:] = positions[i]
+            if velocities is not None:
+                frame_velocities[:] = velocities[i]
+            frame.step = steps[i]
+            self.write(frame)
+
     def set_topology(self, topology, format=""):
         """
         Set the :py:class:`Topology` associated with this :py:class:`Trajectory`.
@@ -73,10 +352,13 @@ class BaseTrajectory(CxxPointer):
         self.__check_opened()
         if isinstance(topology, Topology):
             self.ffi.chfl_trajectory_set_topology(self.mut_ptr, topology.ptr)
+            self.__topology = (copy.copy(topology), format)
         else:
             self.ffi.chfl_trajectory_topology_file(
                 self.mut_ptr, topology.encode("utf8"), format.encode("utf8")
             )
+            self.__topology = (topology, format)
+        self.__shared_topology = None
 
     def set_cell(self, cell):
         """
@@ -88,14 +370,122 @@ class BaseTrajectory(CxxPointer):
         """
         self.__check_opened()
         self.ffi.chfl_trajectory_set_cell(self.mut_ptr, cell.ptr)
+        self.__cell = copy.copy(cell)
+
+    @property
+    def topology(self):
+        """
+        Get a read-only :py:class:`Topology` shared by all the steps of this
+        :py:class:`Trajectory`, for trajectories where the topology does not
+        change between steps.
+
+        This is the topology given to :py:func:`Trajectory.set_topology` if
+        any, and the topology of the first step otherwise. It is loaded the
+        first time this property is accessed, and the same object is returned
+        afterward (until the next call to :py:func:`Trajectory.set_topology`),
+        which avoids getting a separate topology from each :py:class:`Frame`.
+        Use ``copy.copy(trajectory.topology)`` to get a modifiable copy.
+
+        The topology is not loaded again by :py:func:`Trajectory.refresh`.
+        For trajectories opened in write or append mode, this is only
+        available after calling :py:func:`Trajectory.set_topology`.
+        """
+        self.__check_opened()
+        if self.__shared_topology is None:
+            if self.__topology is None:
+                if self.__mode != "r":
+                    raise ChemfilesError(
+                        "the topology of a trajectory opened in "
+                        f"'{self.__mode}' mode is only available after "
+                        "calling set_topology"
+                    )
+                with self._open_reader() as reader:
+                    frame = reader.read_step(0)
+                topology = frame.topology
+            elif isinstance(self.__topology[0], Topology):
+                topology = self.__topology[0]
+            else:
+                path, format = self.__topology
+                with Trajectory(path, "r", format) as reader:
+                    frame = reader.read()
+                topology = frame.topology
+
+            self.__shared_topology = _shared_topology(topology)
+        return self.__shared_topology
+
+    def clone_reader(self):
+        """
+        Open a new :py:class:`Trajectory` reading the same data as this one,
+        with an independent handle in the C library.
+
+        The clone uses the same topology and cell as this trajectory (see
+        :py:func:`Trajectory.set_topology` and :py:func:`Trajectory.set_cell`)
+        and shares the cached number of steps. A single trajectory must not be
+        used from multiple threads at the same time, but each thread can use
+        its own clone, allowing to read different steps in parallel.
+        """
+        self.__check_opened()
+        clone = self._open_reader()
+        clone.__nsteps = self.__nsteps
+        if self.__topology is not None:
+            clone.set_topology(*self.__topology)
+        if self.__cell is not None:
+            clone.set_cell(self.__cell)
+        return clone
+
+    def _open_reader(self):
+        """Open a new read-mode trajectory for the same data"""
+        raise ChemfilesError("can not clone this trajectory")
 
     @property
     def nsteps(self):
-        """Get the current number of steps in this :py:class:`Trajectory`."""
+        """
+        Get the current number of steps in this :py:class:`Trajectory`.
+
+        Computing the number of steps can require reading the whole file, so
+        the value is cached after the first call. Use
+        :py:func:`Trajectory.refresh` to update it if the file is modified by
+        another program.
+        """
         self.__check_opened()
-        nsteps = c_uint64()
-        self.ffi.chfl_trajectory_nsteps(self.mut_ptr, nsteps)
-        return nsteps.value
+        if self.__nsteps is None:
+            nsteps = c_uint64()
+            self.ffi.chfl_trajectory_nsteps(self.mut_ptr, nsteps)
+            self.__nsteps = nsteps.value
+        return self.__nsteps
+
+    def refresh(self):
+        """
+        Discard the cached number of steps in this :py:class:`Trajectory`, and
+        query it again.
+
+        Trajectories opened in read mode from a file are re-opened, to make
+        the steps added to the file by other programs visible. This resets the
+        read position, the next call to :py:func:`Trajectory.read` returning
+        the first step. The topology and cell given to
+        :py:func:`Trajectory.set_topology` and :py:func:`Trajectory.set_cell`
+        are kept, but the topology read from the file is not reloaded.
+        """
+        self.__check_opened()
+        ptr = self._reopen()
+        if ptr is not None:
+            self.ffi.chfl_trajectory_close(self.ptr)
+            self._CxxPointer__ptr = ptr
+            if self.__topology is not None:
+                shared = self.__shared_topology
+                self.set_topology(*self.__topology)
+                self.__shared_topology = shared
+            if self.__cell is not None:
+                self.set_cell(self.__cell)
+        self.__nsteps = None
+        return self.nsteps
+
+    def _reopen(self):
+        """
+        Get a new C pointer reading the same data as this trajectory from the
+        start, or ``None`` if the data can not be read again.
+        """
+        return None
 
     @property
     def path(self):
@@ -122,7 +512,7 @@ class Trajectory(BaseTrajectory):
     :py:class:`Frame`.
     """
 
-    def __init__(self, path, mode="r", format=""):
+    def __init__(self, path, mode="r", format="", index=False):
         """
         Open the file at the given ``path`` using the given ``mode`` and
         optional file ``format``.
@@ -134,6 +524,13 @@ class Trajectory(BaseTrajectory):
         the extension, or when there is not standard extension for this format.
         If `format` is an empty string, the format will be guessed from the
         file extension.
+
+        If ``index`` is ``True`` and the file is opened in read mode, the number
+        of steps in the file is stored in a sidecar index file next to it
+        (``<path>.chfl-idx``), together with the file size and modification
+        time. Opening the same file later with ``index=True`` loads the number
+        of steps from the index instead of scanning the whole file, as long as
+        the file was not modified.
         """
         ptr = self.ffi.chfl_trajectory_with_format(
             path.encode("utf8"), mode.encode("utf8"), format.encode("utf8")
@@ -141,11 +538,33 @@ class Trajectory(BaseTrajectory):
         # Store mode and format for __repr__
         self.__mode = mode
         self.__format = format
-        super(Trajectory, self).__init__(ptr)
+
+        nsteps = None
+        if index and mode == "r":
+            nsteps = _read_index(path, format)
+
+        super(Trajectory, self).__init__(ptr, nsteps, mode)
+
+        if index and mode == "r" and nsteps is None:
+            _write_index(path, format, self.nsteps)
 
     def __repr__(self):
         return f"Trajectory('{self.path}', '{self.__mode}', '{self.__format}')"
 
+    def _open_reader(self):
+        if self.__mode != "r":
+            raise ChemfilesError("can only clone trajectories opened in read mode")
+        return Trajectory(self.path, "r", self.__format)
+
+    def _reopen(self):
+        if self.__mode != "r":
+            return None
+        ptr = self.ffi.chfl_trajectory_with_format(
+            self.path.encode("utf8"), b"r", self.__format.encode("utf8")
+        )
+        _check_handle(ptr)
+        return ptr
+
 
 class MemoryTrajectory(BaseTrajectory):
     """
@@ -158,7 +577,10 @@ class MemoryTrajectory(BaseTrajectory):
         The ``format`` parameter is always required.
 
         When reading (``mode`` is ``'r'``), the ``data`` parameter will be used
-        as the formatted file.
+        as the formatted file. It can be a string, or any contiguous bytes-like
+        object (``bytes``, ``bytearray``, ``memoryview``, ``mmap.mmap``, numpy
+        arrays, ...). Bytes-like objects are used directly without copying
+        them, and are kept alive as long as this trajectory.
 
         When writing (``mode`` is ``'w'``), the ``data`` parameter is ignored.
         To get the memory buffer containing everything already written, use the
@@ -173,29 +595,319 @@ class MemoryTrajectory(BaseTrajectory):
         if mode == "r":
             if isinstance(data, str):
                 data = data.encode("utf8")
-            elif not isinstance(data, bytes):
-                raise ChemfilesError("the 'data' parameter must be a string")
+
+            try:
+                data = np.frombuffer(data, dtype=np.uint8)
+            except (TypeError, BufferError):
+                raise ChemfilesError(
+                    "the 'data' parameter must be a string or a contiguous "
+                    f"bytes-like object, got {type(data)}"
+                )
 
             ptr = self.ffi.chfl_trajectory_memory_reader(
-                data, len(data), format.encode("utf8")
+                cast(data.ctypes.data, c_char_p), len(data), format.encode("utf8")
             )
         elif mode == "w":
             ptr = self.ffi.chfl_trajectory_memory_writer(format.encode("utf8"))
         else:
             raise ChemfilesError(f"invalid mode '{mode}' passed to MemoryTrajectory")
 
-        super(MemoryTrajectory, self).__init__(ptr)
+        # chemfiles does not copy the data when reading, so we need to keep
+        # it alive for as long as the trajectory
+        self.__data = data
+        # Store mode and format for __repr__
+        self.__mode = mode
+        self.__format = format
+        super(MemoryTrajectory, self).__init__(ptr, mode=mode)
 
     def __repr__(self):
-        return f"MemoryTrajectory({self.__mode}', '{self.__format}')"
+        return f"MemoryTrajectory('{self.__mode}', '{self.__format}')"
+
+    def _open_reader(self):
+        if self.__mode != "r":
+            raise ChemfilesError("can only clone trajectories opened in read mode")
+        return MemoryTrajectory(self.__data, "r", self.__format)
+
+    def close(self):
+        """
+        Close this :py:class:`MemoryTrajectory`, and release the data it was
+        reading from.
+        """
+        super(MemoryTrajectory, self).close()
+        # allow the caller to release or resize its buffer (e.g. closing a
+        # mmap) once the trajectory is closed
+        self.__data = None
 
-    def buffer(self):
+    def buffer(self, copy=True):
         """
         Get the data written to this in-memory trajectory. This is not valid to
         call when reading in-memory data.
+
+        By default, this function returns a copy of the data as ``bytes``. If
+        ``copy`` is ``False``, this function returns a read-only numpy array of
+        ``uint8`` directly using the memory of this trajectory, without copying
+        it. This array is invalidated by the next call to
+        :py:func:`MemoryTrajectory.write` or :py:func:`MemoryTrajectory.close`.
         """
         buffer = c_char_p()
         size = c_uint64()
         self.ffi.chfl_trajectory_memory_buffer(self.ptr, buffer, size)
+        address = cast(buffer, c_void_p).value
+        size = size.value
+
+        if copy:
+            return string_at(address, size) if size != 0 else b""
+
+        if size == 0:
+            array = np.empty(0, dtype=np.uint8)
+        else:
+            data = (c_uint8 * size).from_address(address)
+            # keep the trajectory alive as long as the data is used
+            data.trajectory = self
+            array = np.ctypeslib.as_array(data)
+        array.flags.writeable = False
+        return array
+
+
+class StreamingTrajectory(object):
+    """
+    A :py:class:`StreamingTrajectory` writes formatted frames to a file-like
+    object or a callback, without keeping the whole output in memory.
+
+    Frames are formatted in memory, and the data is sent to the output and
+    discarded once it reaches a given size. Each chunk of data is written as an
+    independent file, so this should only be used with formats where
+    concatenating files gives a valid multi-steps file, such as XYZ or SDF.
+    Data that the format only writes when closing a file is not included in
+    the output. In particular, PDB output is not a valid multi-steps file:
+    each chunk of data starts again at ``MODEL 1``, and the final ``END``
+    record is missing.
+    """
+
+    # Set in __init__, defined here for __del__ if __init__ fails
+    __memory = None
+
+    def __init__(self, output, format, flush_size=0):
+        """
+        Create a new :py:class:`StreamingTrajectory` writing data in the given
+        ``format`` to ``output``, which can be an object with a ``write``
+        method (file, pipe, socket file, ...) or a function taking ``bytes``.
+
+        The formatted data is sent to the output after writing a frame, once
+        there are more than ``flush_size`` bytes to send. By default, the data
+        is sent after every frame.
+        """
+        if hasattr(output, "write"):
+            self.__output = output.write
+        elif callable(output):
+            self.__output = output
+        else:
+            raise ChemfilesError(
+                "the 'output' of a StreamingTrajectory must be callable or "
+                "have a 'write' method"
+            )
+
+        self.__format = format
+        self.__flush_size = flush_size
+        self.__topology = None
+        self.__cell = None
+        self.__nsteps = 0
+        self.__memory = MemoryTrajectory(mode="w", format=format)
+
+    def __check_opened(self):
+        if self.__memory is None:
+            raise ChemfilesError("Can not use a closed StreamingTrajectory")
+
+    def __del__(self):
+        if self.__memory is not None:
+            self.close()
+
+    def __enter__(self):
+        self.__check_opened()
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __repr__(self):
+        return f"StreamingTrajectory('{self.__format}')"
+
+    @property
+    def nsteps(self):
+        """Get the number of steps written to this trajectory."""
+        return self.__nsteps
+
+    def write(self, frame):
+        """Write a :py:class:`Frame` to this :py:class:`StreamingTrajectory`."""
+        self.__check_opened()
+        self.__memory.write(frame)
+        self.__nsteps += 1
+        if len(self.__memory.buffer(copy=False)) >= self.__flush_size:
+            self.flush()
+
+    def set_topology(self, topology, format=""):
+        """
+        Set the :py:class:`Topology` associated with this trajectory, with the
+        same semantics as :py:func:`Trajectory.set_topology`.
+        """
+        self.__check_opened()
+        if not isinstance(topology, Topology):
+            with Trajectory(topology, "r", format) as file:
+                topology = copy.copy(file.read().topology)
+        else:
+            topology = copy.copy(topology)
+
+        self.__topology = topology
+        self.__memory.set_topology(topology)
+
+    def set_cell(self, cell):
+        """
+        Set the :py:class:`UnitCell` associated with this trajectory to a copy
+        of ``cell``.
+        """
+        self.__check_opened()
+        self.__cell = copy.copy(cell)
+        self.__memory.set_cell(cell)
+
+    def flush(self):
+        """
+        Send all the data written until now to the output, and discard it from
+        memory.
+        """
+        self.__check_opened()
+        data = self.__memory.buffer()
+        if len(data) == 0:
+            return
+
+        self.__output(data)
+        self.__memory.close()
+        self.__memory = MemoryTrajectory(mode="w", format=self.__format)
+        if self.__topology is not None:
+            self.__memory.set_topology(self.__topology)
+        if self.__cell is not None:
+            self.__memory.set_cell(self.__cell)
+
+    def close(self):
+        """
+        Send any remaining data to the output, and close this trajectory. The
+        output itself is not closed.
+
+        The trajectory is closed even if sending the data fails, and the data
+        is never sent again.
+        """
+        self.__check_opened()
+        try:
+            self.flush()
+        finally:
+            memory = self.__memory
+            self.__memory = None
+            memory.close()
+
+
+_READ_FIELDS = ("positions", "velocities", "cell", "step")
+
+
+def _index_path(path):
+    return path + ".chfl-idx"
+
 
-        return buffer.value
+def _file_metadata(path, format):
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime": stat.st_mtime_ns, "format": format}
+
+
+def _read_index(path, format):
+    """
+    Get the number of steps stored in the sidecar index for the file at
+    ``path``, or ``None`` if there is no valid index for this file.
+    """
+    try:
+        with open(_index_path(path)) as fd:
+            index = json.load(fd)
+        metadata = _file_metadata(path, format)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(index, dict) or "nsteps" not in index:
+        return None
+
+    for key, value in metadata.items():
+        if index.get(key) != value:
+            return None
+
+    return index["nsteps"]
+
+
+def _write_index(path, format, nsteps):
+    """Store ``nsteps`` in the sidecar index for the file at ``path``"""
+    index = _file_metadata(path, format)
+    index["nsteps"] = nsteps
+    try:
+        with open(_index_path(path), "w") as fd:
+            json.dump(index, fd)
+    except OSError as e:
+        message = f"could not write index file for '{path}': {e}"
+        warnings.warn(message, ChemfilesWarning)
+
+
+def _index_trajectory(trajectory, index):
+    """
+    Implementation of ``__getitem__`` for any trajectory-like object with
+    ``nsteps`` and ``read_step``.
+    """
+    nsteps = trajectory.nsteps
+    if isinstance(index, slice):
+        return TrajectorySlice(trajectory, range(*index.indices(nsteps)))
+    elif isinstance(index, numbers.Integral):
+        return trajectory.read_step(_normalize_step(_as_step(index), nsteps))
+    else:
+        steps = [_normalize_step(_as_step(step), nsteps) for step in index]
+        return TrajectorySlice(trajectory, steps)
+
+
+def _as_step(value):
+    """Convert ``value`` (any integer, including numpy integers) to a step"""
+    if isinstance(value, (bool, np.bool_)):
+        raise TypeError("can not use a boolean as a trajectory step")
+    return operator.index(value)
+
+
+def _normalize_step(step, nsteps):
+    """Check that ``step`` is in bounds and make negative steps positive"""
+    if step < 0:
+        step += nsteps
+    if step < 0 or step >= nsteps:
+        raise IndexError(f"step ({step}) out of range for this trajectory")
+    return step
+
+
+def _normalize_range(start, stop, stride, nsteps):
+    """
+    Get the steps in ``range(start, stop, stride)``, where negative ``start``
+    and ``stop`` count from the end, and a ``stop`` of ``None`` means the end
+    of the trajectory. All the steps must be in bounds.
+    """
+    if start < 0:
+        start += nsteps
+
+    if stop is None:
+        stop = nsteps if stride > 0 else -1
+    elif stop < 0:
+        stop += nsteps
+
+    steps = range(start, stop, stride)
+    for step in (steps[0], steps[-1]) if len(steps) != 0 else ():
+        if step < 0 or step >= nsteps:
+            raise IndexError(f"step ({step}) out of range for this trajectory")
+    return steps
+
+
+def _shared_topology(topology):
+    """Get a read-only copy of ``topology``, to be shared by all steps"""
+    ptr = topology.ffi.chfl_topology_copy(topology.ptr)
+    return Topology.from_const_ptr(
+        None,
+        ptr,
+        "this topology is shared by all steps and read-only, "
+        "use copy.copy() to modify it",
+    )
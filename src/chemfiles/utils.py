@@ -1,3 +1,5 @@
+import queue
+import threading
 from ctypes import c_uint64, create_string_buffer
 
 from ._c_lib import _get_c_library
@@ -17,6 +19,9 @@ class CxxPointer(object):
     # living inside another object (typically atoms inside a frame, or
     # residue in a topology).
     __origin = None
+    # Error message for const objects which are read-only by design, used
+    # instead of the generic message when trying to modify them
+    __read_only = None
 
     def __init__(self, ptr, is_const=True, origin=None):
         self.__ptr = ptr
@@ -44,16 +49,23 @@ class CxxPointer(object):
         return new
 
     @classmethod
-    def from_const_ptr(cls, origin, ptr):
-        """Create a new instance from a const pointer"""
+    def from_const_ptr(cls, origin, ptr, read_only=None):
+        """
+        Create a new instance from a const pointer. ``read_only`` is the error
+        message used when trying to modify the new instance, if it is
+        read-only by design.
+        """
         new = cls.__new__(cls)
         super(cls, new).__init__(ptr, is_const=True, origin=origin)
+        new.__read_only = read_only
         return new
 
     @property
     def mut_ptr(self):
         """Get the **mutable** C++ pointer for this object"""
         if self.__is_const:
+            if self.__read_only is not None:
+                raise ChemfilesError(self.__read_only)
             raise ChemfilesError(
                 "Trying to use a const pointer for mutable access, this is a bug"
             )
@@ -118,3 +130,94 @@ def _call_with_growing_buffer(function, initial):
         function(buffer, c_uint64(size))
 
     return buffer.value.decode("utf8")
+
+
+# Marker returned by _BoundedProducer.get once all the items were produced
+_END = object()
+
+
+class _BoundedProducer(object):
+    """
+    Consume the ``items`` iterable on a background thread, keeping at most
+    ``maxsize`` produced items waiting to be used by :py:func:`get`.
+
+    The thread only keeps references to the iterable and the queue, so that
+    objects owning a producer can still stop it from ``__del__``.
+    """
+
+    def __init__(self, items, maxsize):
+        self.__queue = queue.Queue(maxsize=maxsize)
+        self.__stop = threading.Event()
+        self.__finished = False
+        self.__thread = threading.Thread(
+            target=_produce_items,
+            args=(items, self.__queue, self.__stop),
+            daemon=True,
+        )
+        self.__thread.start()
+
+    def get(self):
+        """
+        Get the next item, waiting for it if needed, or ``_END`` once all the
+        items were produced. Any exception raised by the iterable on the
+        background thread is raised here.
+        """
+        if self.__finished:
+            return _END
+
+        item = self.__queue.get()
+        if item is _END:
+            self.__finished = True
+        elif isinstance(item, _ProducerError):
+            self.__finished = True
+            raise item.error
+        return item
+
+    def stop(self):
+        """
+        Stop the background thread and wait for it, returning the list of
+        items produced but not yet used.
+        """
+        self.__stop.set()
+        # remove pending items to unblock the thread if it is waiting
+        unused = []
+        while True:
+            try:
+                item = self.__queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _END and not isinstance(item, _ProducerError):
+                unused.append(item)
+        self.__thread.join()
+        self.__finished = True
+        return unused
+
+
+class _ProducerError(object):
+    """Exception raised by the iterable of a _BoundedProducer"""
+
+    def __init__(self, error):
+        self.error = error
+
+
+def _produce_items(items, output, stop):
+    """Put all ``items`` in the ``output`` queue, until ``stop`` is set"""
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                output.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    try:
+        for item in items:
+            if not put(item):
+                return
+    except BaseException as e:
+        put(_ProducerError(e))
+        return
+
+    put(_END)
@@ -1,3 +1,5 @@
+import os
+
 import chemfiles
 
 
@@ -10,3 +12,14 @@ class RemoveChemfilesWarnings(object):
 
 
 remove_warnings = RemoveChemfilesWarnings()
+
+
+def get_data_path(data):
+    root = os.path.dirname(__file__)
+    return os.path.join(root, "data", data)
+
+
+def water_positions():
+    """Get the positions of all the steps in ``data/water.xyz``"""
+    with chemfiles.Trajectory(get_data_path("water.xyz")) as trajectory:
+        return trajectory.read_positions()
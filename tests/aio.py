@@ -0,0 +1,69 @@
+import asyncio
+import unittest
+
+import numpy as np
+from _utils import get_data_path, remove_warnings, water_positions
+
+from chemfiles import AsyncTrajectory, ChemfilesError
+
+
+class TestAsyncTrajectory(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.expected = water_positions()
+
+    def test_read(self):
+        async def main():
+            async with AsyncTrajectory(get_data_path("water.xyz")) as trajectory:
+                self.assertEqual(await trajectory.nsteps(), 100)
+
+                frame = await trajectory.read()
+                self.assertTrue(np.array_equal(frame.positions, self.expected[0]))
+
+                frame = await trajectory.read_step(41)
+                self.assertTrue(np.array_equal(frame.positions, self.expected[41]))
+
+            with self.assertRaises(ChemfilesError):
+                await trajectory.read()
+
+        asyncio.run(main())
+
+    def test_iter(self):
+        async def main():
+            trajectory = AsyncTrajectory(get_data_path("water.xyz"), "XYZ")
+            count = 0
+            async for frame in trajectory:
+                self.assertTrue(np.array_equal(frame.positions, self.expected[count]))
+                count += 1
+            self.assertEqual(count, 100)
+
+            steps = []
+            async for frame in trajectory.frames([50, 2, 7], prefetch=1):
+                steps.append(frame.positions[0][0])
+            self.assertEqual(steps, list(self.expected[[50, 2, 7], 0, 0]))
+
+            # stop iterating early
+            async for frame in trajectory.frames(prefetch=10):
+                break
+
+            await trajectory.close()
+
+        asyncio.run(main())
+
+    def test_errors(self):
+        async def main():
+            with remove_warnings:
+                trajectory = AsyncTrajectory(get_data_path("not-here.xyz"))
+                with self.assertRaises(ChemfilesError):
+                    await trajectory.read()
+                await trajectory.close()
+
+                with self.assertRaises(ChemfilesError):
+                    async with AsyncTrajectory(get_data_path("not-here.xyz")):
+                        pass
+
+        asyncio.run(main())
+
+
+if __name__ == "__main__":
+    unittest.main()
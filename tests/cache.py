@@ -0,0 +1,212 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+from _utils import get_data_path
+
+from chemfiles import (
+    Atom,
+    BondOrder,
+    CachedTrajectory,
+    CellShape,
+    ChemfilesError,
+    Frame,
+    Residue,
+    Trajectory,
+    UnitCell,
+)
+
+
+class TestCachedTrajectory(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "water.xyz")
+        shutil.copy(get_data_path("water.xyz"), self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_read(self):
+        with Trajectory(self.path) as trajectory:
+            expected = trajectory.read_positions()
+
+        with CachedTrajectory(self.path, chunk=16) as trajectory:
+            self.assertTrue(os.path.exists(self.path + ".chfl-cache"))
+            self.assertEqual(trajectory.nsteps, 100)
+            self.assertEqual(len(trajectory), 100)
+            self.assertEqual(trajectory.path, self.path)
+            self.assertEqual(repr(trajectory), f"CachedTrajectory('{self.path}')")
+
+            frame = trajectory.read()
+            self.assertEqual(frame.step, 0)
+            self.assertEqual(len(frame.atoms), 297)
+            self.assertEqual(frame.atoms[0].name, "O")
+            self.assertTrue(np.array_equal(frame.positions, expected[0]))
+
+            frame = trajectory.read_step(42)
+            self.assertEqual(frame.step, 42)
+            self.assertTrue(np.array_equal(frame.positions, expected[42]))
+            frame = trajectory.read()
+            self.assertEqual(frame.step, 43)
+
+            frame = trajectory[np.int64(-1)]
+            self.assertTrue(np.array_equal(frame.positions, expected[99]))
+            steps = [frame.step for frame in trajectory[10:40:7]]
+            self.assertEqual(steps, [10, 17, 24, 31, 38])
+            self.assertEqual(len(list(trajectory)), 100)
+
+            positions = trajectory.read_positions()
+            self.assertTrue(np.array_equal(positions, expected))
+            positions = trajectory.read_positions(3, 70, 9, dtype=np.float32)
+            self.assertEqual(positions.dtype, np.float32)
+            self.assertTrue(np.allclose(positions, expected[3:70:9]))
+
+            out = np.zeros((2, 297, 3))
+            trajectory.read_positions(98, out=out)
+            self.assertTrue(np.array_equal(out, expected[98:]))
+
+            self.assertRaises(IndexError, trajectory.read_step, 100)
+            self.assertRaises(IndexError, trajectory.read_positions, 0, 101)
+            self.assertRaises(IndexError, trajectory.read_positions, -101)
+
+            positions = trajectory.read_positions(-5)
+            self.assertTrue(np.array_equal(positions, expected[-5:]))
+            positions = trajectory.read_positions(50, -40, 4)
+            self.assertTrue(np.array_equal(positions, expected[50:-40:4]))
+            positions = trajectory.read_positions(90, stride=-7)
+            self.assertTrue(np.array_equal(positions, expected[90::-7]))
+            self.assertRaises(ChemfilesError, trajectory.read_positions, out=out)
+
+        self.assertRaises(ChemfilesError, trajectory.read)
+        self.assertRaises(ChemfilesError, CachedTrajectory, self.path, chunk=0)
+
+    def test_invalidation(self):
+        cache = os.path.join(self.tmpdir, "cache")
+        with CachedTrajectory(self.path, cache=cache) as trajectory:
+            self.assertEqual(trajectory.nsteps, 100)
+        self.assertFalse(os.path.exists(self.path + ".chfl-cache"))
+
+        # the cache is re-used as long as the file is not modified
+        mtime = os.stat(cache).st_mtime_ns
+        with CachedTrajectory(self.path, cache=cache) as trajectory:
+            self.assertEqual(trajectory.nsteps, 100)
+        self.assertEqual(os.stat(cache).st_mtime_ns, mtime)
+
+        with Trajectory(self.path, "w") as trajectory:
+            trajectory.write_positions(np.zeros((3, 4, 3)))
+
+        with CachedTrajectory(self.path, cache=cache) as trajectory:
+            self.assertEqual(trajectory.nsteps, 3)
+            self.assertEqual(len(trajectory.read().atoms), 4)
+
+        # invalid cache files are replaced
+        with open(cache, "w") as fd:
+            fd.write("not a cache")
+        with CachedTrajectory(self.path, cache=cache) as trajectory:
+            self.assertEqual(trajectory.nsteps, 3)
+
+    def test_topology(self):
+        frame = Frame()
+        frame.add_atom(Atom("Zn"), [1, 2, 3])
+        frame.add_atom(Atom("O1", "O"), [2, 2, 3])
+        frame.add_atom(Atom("H1", "H"), [3, 2, 3])
+        frame.atoms[0].charge = 2.0
+        frame.atoms[2].mass = 2.0
+        frame.add_bond(1, 2, BondOrder.Single)
+
+        residue = Residue("WAT", 3)
+        residue.atoms.append(1)
+        residue.atoms.append(2)
+        frame.add_residue(residue)
+
+        frame.add_velocities()
+        frame.velocities[:] = [[0.5, 0, 0], [1, 1, 1], [0, 0, 2]]
+        frame.cell = UnitCell([10, 11, 12], [90, 80, 100])
+
+        path = os.path.join(self.tmpdir, "test.gro")
+        with Trajectory(path, "w") as trajectory:
+            trajectory.write(frame)
+            frame.positions[0] = [5, 5, 5]
+            trajectory.write(frame)
+
+        with Trajectory(path) as trajectory:
+            expected = trajectory.read_step(1)
+
+        with CachedTrajectory(path, chunk=1) as trajectory:
+            topology = trajectory.topology
+            self.assertIs(trajectory.topology, topology)
+            with self.assertRaises(ChemfilesError) as context:
+                topology.resize(2)
+            self.assertEqual(
+                str(context.exception),
+                "this topology is shared by all steps and read-only, "
+                "use copy.copy() to modify it",
+            )
+            with self.assertRaises(ChemfilesError) as context:
+                topology.residues[0]["foo"] = 3
+            self.assertIn("read-only", str(context.exception))
+            self.assertEqual([atom.name for atom in topology.atoms], ["Zn", "O1", "H1"])
+
+            frame = trajectory.read_step(1)
+            self.assertTrue(np.array_equal(frame.positions, expected.positions))
+            self.assertTrue(frame.has_velocities())
+            self.assertTrue(np.array_equal(frame.velocities, expected.velocities))
+            self.assertEqual(frame.cell.shape, CellShape.Triclinic)
+            self.assertTrue(np.array_equal(frame.cell.matrix, expected.cell.matrix))
+
+            atoms = expected.atoms
+            for i, atom in enumerate(frame.atoms):
+                self.assertEqual(atom.name, atoms[i].name)
+                self.assertEqual(atom.type, atoms[i].type)
+                self.assertEqual(atom.mass, atoms[i].mass)
+                self.assertEqual(atom.charge, atoms[i].charge)
+
+            residues = frame.topology.residues
+            self.assertEqual(len(residues), len(expected.topology.residues))
+            residue = frame.topology.residue_for_atom(1)
+            self.assertEqual(residue.name, "WAT")
+            self.assertEqual(residue.id, 3)
+            self.assertEqual(list(residue.atoms), [1, 2])
+
+        frame = Frame()
+        frame.add_atom(Atom("C"), [1, 2, 3])
+        frame.add_atom(Atom("O"), [2, 2, 3])
+        frame.add_bond(0, 1, BondOrder.Double)
+
+        path = os.path.join(self.tmpdir, "test.sdf")
+        with Trajectory(path, "w") as trajectory:
+            trajectory.write(frame)
+
+        with CachedTrajectory(path) as trajectory:
+            topology = trajectory.read().topology
+            self.assertEqual(topology.bonds.tolist(), [[0, 1]])
+            self.assertEqual(topology.bonds_orders, [BondOrder.Double])
+
+    def test_empty_frames(self):
+        path = os.path.join(self.tmpdir, "empty.xyz")
+        with Trajectory(path, "w") as trajectory:
+            trajectory.write(Frame())
+            trajectory.write(Frame())
+
+        with CachedTrajectory(path) as trajectory:
+            self.assertEqual(trajectory.nsteps, 2)
+            frame = trajectory.read_step(1)
+            self.assertEqual(len(frame.atoms), 0)
+            self.assertEqual(trajectory.read_positions().shape, (2, 0, 3))
+
+    def test_errors(self):
+        frame = Frame()
+        frame.resize(3)
+        with Trajectory(self.path, "w") as trajectory:
+            trajectory.write(frame)
+            frame.resize(4)
+            trajectory.write(frame)
+
+        self.assertRaises(ChemfilesError, CachedTrajectory, self.path)
+        self.assertEqual(os.listdir(self.tmpdir), ["water.xyz"])
+
+
+if __name__ == "__main__":
+    unittest.main()
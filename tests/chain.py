@@ -0,0 +1,92 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+from _utils import get_data_path, remove_warnings, water_positions
+
+from chemfiles import (
+    Atom,
+    ChainTrajectory,
+    ChemfilesError,
+    Topology,
+    Trajectory,
+    UnitCell,
+)
+
+
+class TestChainTrajectory(unittest.TestCase):
+    def setUp(self):
+        self.expected = water_positions()
+
+        # split the water trajectory in 4 segments
+        self.tmpdir = tempfile.mkdtemp()
+        self.paths = []
+        for i, (start, stop) in enumerate([(0, 10), (10, 45), (45, 46), (46, 100)]):
+            path = os.path.join(self.tmpdir, f"segment-{i}.xyz")
+            with Trajectory(path, "w") as trajectory:
+                trajectory.write_positions(self.expected[start:stop])
+            self.paths.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_read(self):
+        with ChainTrajectory(self.paths, max_open=2, threads=2) as trajectory:
+            self.assertEqual(trajectory.paths, self.paths)
+            self.assertEqual(trajectory.nsteps, 100)
+            self.assertEqual(len(trajectory), 100)
+
+            for step, frame in enumerate(trajectory):
+                self.assertTrue(np.allclose(frame.positions, self.expected[step]))
+
+            for step in [45, 3, 99, 10, 9, 46]:
+                frame = trajectory.read_step(step)
+                self.assertTrue(np.allclose(frame.positions, self.expected[step]))
+
+            frame = trajectory.read()
+            self.assertTrue(np.allclose(frame.positions, self.expected[47]))
+
+            frame = trajectory[-1]
+            self.assertTrue(np.allclose(frame.positions, self.expected[99]))
+            frame = trajectory[np.int64(46)]
+            self.assertTrue(np.allclose(frame.positions, self.expected[46]))
+
+            frames = list(trajectory[5:60:10])
+            self.assertEqual(len(frames), 6)
+            for frame, step in zip(frames, range(5, 60, 10)):
+                self.assertTrue(np.allclose(frame.positions, self.expected[step]))
+
+            self.assertRaises(IndexError, trajectory.read_step, 100)
+
+        self.assertRaises(ChemfilesError, trajectory.read)
+
+    def test_topology_and_cell(self):
+        topology = Topology()
+        for i in range(297):
+            topology.atoms.append(Atom("Zn"))
+
+        trajectory = ChainTrajectory(self.paths, format="XYZ", max_open=1)
+        frame = trajectory.read_step(5)
+        self.assertEqual(frame.atoms[0].name, "X")
+
+        trajectory.set_topology(topology)
+        trajectory.set_cell(UnitCell([12, 12, 12]))
+        for step in [5, 50]:
+            frame = trajectory.read_step(step)
+            self.assertEqual(frame.atoms[0].name, "Zn")
+            self.assertEqual(frame.cell.lengths, (12.0, 12.0, 12.0))
+        trajectory.close()
+
+    def test_errors(self):
+        self.assertRaises(ChemfilesError, ChainTrajectory, self.paths, max_open=0)
+
+        with remove_warnings:
+            paths = self.paths + [os.path.join(self.tmpdir, "not-here.xyz")]
+            trajectory = ChainTrajectory(paths)
+            self.assertRaises(ChemfilesError, trajectory.read)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+from _utils import get_data_path
+
+from chemfiles import (
+    ChemfilesError,
+    Frame,
+    MemoryTrajectory,
+    Trajectory,
+    UnitCell,
+    export_npy,
+    load_npy,
+)
+
+
+class TestExport(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_export(self):
+        path = get_data_path("water.xyz")
+        output = os.path.join(self.tmpdir, "water")
+        export_npy(path, output)
+
+        data = load_npy(output)
+        self.assertEqual(set(data.keys()), {"steps", "positions", "cells"})
+        self.assertIsInstance(data["positions"], np.memmap)
+        self.assertEqual(data["positions"].shape, (100, 297, 3))
+        self.assertEqual(data["cells"].shape, (100, 3, 3))
+        self.assertEqual(data["steps"].shape, (100,))
+
+        with Trajectory(path) as trajectory:
+            expected = trajectory.read_positions()
+            frame = trajectory.read_step(41)
+            cell = frame.cell.matrix
+            step = frame.step
+
+        self.assertTrue(np.array_equal(data["positions"], expected))
+        self.assertTrue(np.array_equal(data["cells"][41], cell))
+        self.assertEqual(data["steps"][41], step)
+
+        export_npy(path, output, fields=["cells"], format="XYZ")
+        data = load_npy(output)
+        self.assertEqual(set(data.keys()), {"steps", "cells"})
+
+    def test_velocities(self):
+        positions = np.random.random((3, 4, 3))
+        velocities = np.random.random((3, 4, 3))
+        path = os.path.join(self.tmpdir, "input.gro")
+        with Trajectory(path, "w") as trajectory:
+            trajectory.write_positions(
+                positions, cell=UnitCell([10, 10, 10]), velocities=velocities
+            )
+
+        output = os.path.join(self.tmpdir, "output")
+        export_npy(path, output)
+        data = load_npy(output, mode="r+")
+        self.assertEqual(
+            set(data.keys()), {"steps", "positions", "velocities", "cells"}
+        )
+        self.assertTrue(np.allclose(data["velocities"], velocities, atol=1e-2))
+        self.assertTrue(np.allclose(data["cells"][2], np.diag([10, 10, 10])))
+
+    def test_errors(self):
+        path = get_data_path("water.xyz")
+        output = os.path.join(self.tmpdir, "output")
+        self.assertRaises(ChemfilesError, export_npy, path, output, ["bonds"])
+        self.assertRaises(ChemfilesError, load_npy, self.tmpdir)
+
+        frame = Frame()
+        frame.resize(3)
+        trajectory = MemoryTrajectory(mode="w", format="XYZ")
+        trajectory.write(frame)
+        frame.resize(4)
+        trajectory.write(frame)
+
+        path = os.path.join(self.tmpdir, "input.xyz")
+        with open(path, "wb") as fd:
+            fd.write(trajectory.buffer())
+        self.assertRaises(ChemfilesError, export_npy, path, output)
+
+
+if __name__ == "__main__":
+    unittest.main()
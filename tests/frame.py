@@ -11,6 +11,7 @@ from chemfiles import (
     CellShape,
     ChemfilesError,
     Frame,
+    FrameArray,
     Residue,
     Topology,
     UnitCell,
@@ -100,6 +101,76 @@ class TestFrame(unittest.TestCase):
         frame.add_velocities()
         _ = frame.velocities
 
+    def test_positions_as(self):
+        frame = Frame()
+        frame.resize(4)
+        frame.positions[:] = np.arange(12).reshape(4, 3) + 0.5
+
+        positions = frame.positions_as(np.float32)
+        self.assertEqual(positions.dtype, np.float32)
+        self.assertTrue(np.array_equal(positions, frame.positions))
+        positions[0, 0] = 42
+        self.assertEqual(frame.positions[0, 0], 0.5)
+
+        out = np.zeros((4, 3), dtype=np.float32)
+        self.assertIs(frame.positions_as(np.float32, out=out), out)
+        self.assertTrue(np.array_equal(out, frame.positions))
+
+        batch = np.zeros((2, 4, 3), dtype=np.float16)
+        frame.positions_as(np.float16, out=batch[1])
+        self.assertTrue(np.array_equal(batch[1], frame.positions))
+
+        self.assertRaises(ChemfilesError, frame.positions_as, np.float64, out)
+        out = np.zeros((3, 3), dtype=np.float32)
+        self.assertRaises(ChemfilesError, frame.positions_as, np.float32, out)
+
+        self.assertEqual(Frame().positions_as(np.float32).shape, (0, 3))
+
+        frame.add_velocities()
+        frame.velocities[2] = [1, 2, 3]
+        velocities = frame.velocities_as(np.float32)
+        self.assertEqual(velocities.dtype, np.float32)
+        self.assertEqual(velocities[2].tolist(), [1, 2, 3])
+
+    def test_positions_view(self):
+        frame = Frame()
+        frame.resize(2)
+        positions = frame.positions_view()
+        self.assertIsInstance(positions, FrameArray)
+        self.assertEqual(positions.shape, (2, 3))
+        positions[1] = [1, 2, 3]
+        self.assertEqual(frame.positions[1].tolist(), [1, 2, 3])
+
+        frame.resize(1000)
+        frame.add_atom(Atom("Zn"), [4, 5, 6])
+        self.assertEqual(len(positions), 1001)
+        self.assertEqual(positions[1].tolist(), [1, 2, 3])
+        self.assertEqual(positions[-1].tolist(), [4, 5, 6])
+        positions[-1] = [7, 8, 9]
+        self.assertEqual(frame.positions[1000].tolist(), [7, 8, 9])
+
+        frame.remove(0)
+        self.assertEqual(np.asarray(positions).shape, (1000, 3))
+        self.assertEqual(np.asarray(positions)[0].tolist(), [1, 2, 3])
+        self.assertEqual(np.asarray(positions, dtype=np.float32).dtype, np.float32)
+        self.assertTrue(np.array_equal(positions.array, frame.positions))
+
+        strict = frame.positions_view(refresh=False)
+        self.assertEqual(strict[0].tolist(), [1, 2, 3])
+        frame.resize(2)
+        with self.assertRaises(ChemfilesError):
+            strict[0]
+
+        with remove_warnings:
+            self.assertRaises(ChemfilesError, frame.velocities_view)
+
+        frame.add_velocities()
+        velocities = frame.velocities_view()
+        velocities[0] = [1, 1, 1]
+        frame.resize(3)
+        self.assertEqual(velocities[0].tolist(), [1, 1, 1])
+        self.assertEqual(velocities.shape, (3, 3))
+
     def test_cell(self):
         frame = Frame()
         frame.cell = UnitCell([1, 2, 4])
@@ -147,6 +218,81 @@ class TestFrame(unittest.TestCase):
             self.assertEqual(atom.name, "")
         self.assertEqual(i, 2)
 
+    def test_atoms_indexing(self):
+        frame = Frame()
+        for name in ["A", "B", "C", "D"]:
+            frame.add_atom(Atom(name), [0, 0, 0])
+
+        self.assertEqual(frame.atoms[-1].name, "D")
+        self.assertEqual(frame.atoms[-4].name, "A")
+        self.assertEqual([atom.name for atom in frame.atoms[1:3]], ["B", "C"])
+        self.assertEqual([atom.name for atom in frame.atoms[::-2]], ["D", "B"])
+        self.assertEqual(frame.atoms[10:], [])
+        self.assertEqual(repr(frame.atoms[:1]), "[Atom('A')]")
+
+        frame.atoms[-2].name = "E"
+        self.assertEqual(frame.atoms[2].name, "E")
+
+        with self.assertRaises(IndexError):
+            frame.atoms[4]
+        with self.assertRaises(IndexError):
+            frame.atoms[-5]
+
+    def test_atoms_arrays(self):
+        frame = Frame()
+        frame.add_atom(Atom("O"), [0, 0, 0])
+        frame.add_atom(Atom("H1", "H"), [0, 0, 0])
+        frame.add_atom(Atom("Xx"), [0, 0, 0])
+        frame.atoms[1].charge = 0.5
+
+        atoms = frame.atoms
+        self.assertEqual(list(atoms.names), ["O", "H1", "Xx"])
+        self.assertEqual(list(atoms.types), ["O", "H", "Xx"])
+        self.assertTrue(np.allclose(atoms.masses, [15.999, 0.0, 0.0]))
+        self.assertEqual(atoms.masses.dtype, np.float64)
+        self.assertTrue(np.array_equal(atoms.charges, [0.0, 0.5, 0.0]))
+        self.assertTrue(np.array_equal(atoms.atomic_numbers, [8, 1, 0]))
+        self.assertTrue(np.allclose(atoms.vdw_radii, [1.55, 1.2, 0.0]))
+        self.assertTrue(np.allclose(atoms.covalent_radii, [0.73, 0.37, 0.0]))
+
+        atoms.masses = [1, 2, 3]
+        self.assertEqual(frame.atoms[2].mass, 3)
+        atoms.charges = -1.0
+        self.assertEqual(list(frame.atoms.charges), [-1.0, -1.0, -1.0])
+
+        long_name = "a very long name " * 10
+        atoms.names = ["A", long_name, "C"]
+        self.assertEqual(list(frame.atoms.names), ["A", long_name, "C"])
+        self.assertEqual(frame.atoms[1].name, long_name)
+        atoms.types = ["Zn", "Zn", "Fe"]
+        self.assertEqual(list(frame.topology.atoms.types), ["Zn", "Zn", "Fe"])
+
+        self.assertRaises(ChemfilesError, setattr, atoms, "names", ["A"])
+        self.assertRaises(ValueError, setattr, atoms, "masses", [1, 2])
+
+        self.assertEqual(Frame().atoms.masses.shape, (0,))
+        self.assertEqual(list(Frame().atoms.names), [])
+
+    def test_atoms_categorical(self):
+        frame = Frame()
+        for name in ["O", "H1", "H2", "O", "H1", "H2"]:
+            frame.add_atom(Atom(name, name[0]), [0, 0, 0])
+
+        codes, names = frame.atoms.categorical("name")
+        self.assertEqual(names, ["O", "H1", "H2"])
+        self.assertEqual(list(codes), [0, 1, 2, 0, 1, 2])
+
+        codes, types = frame.atoms.categorical("type")
+        self.assertEqual(types, ["O", "H"])
+        self.assertEqual(list(codes), [0, 1, 1, 0, 1, 1])
+        self.assertEqual(np.bincount(codes).tolist(), [2, 4])
+
+        codes, types = Frame().atoms.categorical("type")
+        self.assertEqual(types, [])
+        self.assertEqual(codes.shape, (0,))
+
+        self.assertRaises(ChemfilesError, frame.atoms.categorical, "mass")
+
     def test_property(self):
         frame = Frame()
 
@@ -0,0 +1,40 @@
+import operator
+import unittest
+
+from _utils import get_data_path, water_positions
+
+from chemfiles import map_frames
+
+
+def first_x(frame):
+    return frame.positions[0][0]
+
+
+def atoms_count(frame):
+    return len(frame.atoms)
+
+
+class TestParallel(unittest.TestCase):
+    def test_map_frames(self):
+        path = get_data_path("water.xyz")
+        expected = list(water_positions()[:, 0, 0])
+
+        results = map_frames(path, first_x, workers=2)
+        self.assertEqual(results, expected)
+
+        results = map_frames(path, first_x, workers=3, chunk=7, format="XYZ")
+        self.assertEqual(results, expected)
+
+    def test_reduce(self):
+        path = get_data_path("water.xyz")
+        total = map_frames(path, atoms_count, reduce=operator.add, workers=2)
+        self.assertEqual(total, 100 * 297)
+
+        total = map_frames(
+            path, atoms_count, reduce=operator.add, workers=2, chunk=1000
+        )
+        self.assertEqual(total, 100 * 297)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+from _utils import get_data_path, water_positions
+
+from chemfiles import ChemfilesError, Selection, Trajectory, convert
+
+
+def remove_hydrogens(frame):
+    selection = Selection("type H")
+    for i in reversed(selection.evaluate(frame)):
+        frame.remove(i)
+    return frame
+
+
+def shift(frame):
+    frame.positions[:] += frame.step
+    return frame
+
+
+def skip_odd(frame):
+    if frame.step % 2 == 1:
+        return None
+    return frame
+
+
+class TestConvert(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.input = get_data_path("water.xyz")
+        self.expected = water_positions()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_convert(self):
+        output = os.path.join(self.tmpdir, "water.pdb")
+        self.assertEqual(convert(self.input, output), 100)
+
+        with Trajectory(output) as trajectory:
+            self.assertEqual(trajectory.nsteps, 100)
+            positions = trajectory.read_positions()
+        self.assertTrue(np.allclose(positions, self.expected, atol=1e-3))
+
+    def test_transforms(self):
+        output = os.path.join(self.tmpdir, "output.xyz")
+        calls = []
+        written = convert(
+            self.input,
+            output,
+            transforms=[remove_hydrogens, shift, skip_odd],
+            threads=4,
+            output_format="XYZ",
+            buffer=3,
+            progress=lambda done, total: calls.append((done, total)),
+        )
+        self.assertEqual(written, 50)
+        self.assertEqual(calls, [(i, 100) for i in range(1, 101)])
+
+        with Trajectory(output) as trajectory:
+            self.assertEqual(trajectory.nsteps, 50)
+            frame = trajectory.read()
+            self.assertEqual(len(frame.atoms), 99)
+            self.assertEqual(frame.atoms[0].name, "O")
+            positions = trajectory.read_positions()
+
+        # the frames are written in the same order as the input
+        for i in range(50):
+            step = 2 * i
+            expected = self.expected[step, ::3] + step
+            self.assertTrue(np.allclose(positions[i], expected, atol=1e-4))
+
+    def test_errors(self):
+        output = os.path.join(self.tmpdir, "output.xyz")
+        self.assertRaises(ChemfilesError, convert, self.input, output, buffer=0)
+        self.assertRaises(ChemfilesError, convert, self.input, output, threads=0)
+
+        def fail(frame):
+            if frame.step == 42:
+                raise ValueError("failed on step 42")
+            return frame
+
+        with self.assertRaises(ValueError):
+            convert(self.input, output, transforms=[fail], buffer=2)
+
+        def stop(done, total):
+            if done == 10:
+                raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            convert(self.input, output, progress=stop)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+import numpy as np
+from _utils import get_data_path, remove_warnings, water_positions
+
+from chemfiles import ChemfilesError, Trajectory, TrajectoryPool
+
+
+class TestTrajectoryPool(unittest.TestCase):
+    def setUp(self):
+        self.expected = water_positions()
+
+        self.tmpdir = tempfile.mkdtemp()
+        self.paths = []
+        for i in range(5):
+            path = os.path.join(self.tmpdir, f"file-{i}.xyz")
+            with Trajectory(path, "w") as trajectory:
+                trajectory.write_positions(self.expected[i : i + 3])
+            self.paths.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_open(self):
+        with TrajectoryPool(max_open=2) as pool:
+            with pool.open(self.paths[0]) as trajectory:
+                first = trajectory
+
+            with pool.open(self.paths[0], "") as trajectory:
+                self.assertIs(trajectory, first)
+                frame = trajectory.read_step(1)
+                self.assertTrue(np.allclose(frame.positions, self.expected[1]))
+
+            with pool.open(self.paths[1], "XYZ") as trajectory:
+                frame = trajectory.read_step(0)
+                self.assertTrue(np.allclose(frame.positions, self.expected[1]))
+            self.assertEqual(len(pool), 2)
+
+            # the least recently used trajectory is closed
+            with pool.open(self.paths[2]) as trajectory:
+                pass
+            self.assertEqual(len(pool), 2)
+            self.assertRaises(ChemfilesError, first.read)
+
+            # trajectories in use are not closed
+            with pool.open(self.paths[3]) as used:
+                for path in self.paths:
+                    with pool.open(path) as trajectory:
+                        trajectory.read()
+                self.assertEqual(used.nsteps, 3)
+
+        self.assertRaises(ChemfilesError, used.read)
+        with self.assertRaises(ChemfilesError):
+            with pool.open(self.paths[0]):
+                pass
+
+    def test_errors(self):
+        self.assertRaises(ChemfilesError, TrajectoryPool, 0)
+
+        pool = TrajectoryPool()
+        with remove_warnings:
+            with self.assertRaises(ChemfilesError):
+                with pool.open(os.path.join(self.tmpdir, "not-here.xyz")):
+                    pass
+        self.assertEqual(len(pool), 0)
+
+        # errors while using a trajectory keep it open
+        with self.assertRaises(ChemfilesError):
+            with pool.open(self.paths[0]) as trajectory:
+                raise ChemfilesError("error")
+        with pool.open(self.paths[0]) as other:
+            self.assertIs(other, trajectory)
+
+    def test_threads(self):
+        pool = TrajectoryPool(max_open=2)
+        errors = []
+
+        def work(index):
+            try:
+                for i in range(20):
+                    path_index = (index + i) % len(self.paths)
+                    with pool.open(self.paths[path_index]) as trajectory:
+                        frame = trajectory.read_step(i % 3)
+                        expected = self.expected[path_index + i % 3]
+                        if not np.allclose(frame.positions, expected):
+                            errors.append((index, i))
+            except BaseException as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(pool), 2)
+        pool.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+import numpy as np
+from _utils import get_data_path, remove_warnings, water_positions
+
+from chemfiles import ChemfilesError, PrefetchingTrajectory, Trajectory
+
+
+class TestPrefetchingTrajectory(unittest.TestCase):
+    def test_read(self):
+        expected = water_positions()
+
+        trajectory = PrefetchingTrajectory(Trajectory(get_data_path("water.xyz")))
+        self.assertEqual(trajectory.nsteps, 100)
+        self.assertEqual(len(trajectory), 100)
+
+        frame = trajectory.read()
+        self.assertTrue(np.array_equal(frame.positions, expected[0]))
+
+        for step, frame in enumerate(trajectory):
+            self.assertTrue(np.array_equal(frame.positions, expected[step + 1]))
+        self.assertEqual(step, 98)
+
+        self.assertRaises(ChemfilesError, trajectory.read)
+        trajectory.close()
+        self.assertRaises(ChemfilesError, trajectory.read)
+
+    def test_steps(self):
+        expected = water_positions()
+
+        trajectory = Trajectory(get_data_path("water.xyz"))
+        with PrefetchingTrajectory(trajectory, 2, steps=[50, 3, 7]) as prefetch:
+            self.assertEqual(prefetch.nsteps, 3)
+            frames = list(prefetch)
+
+        self.assertEqual(len(frames), 3)
+        for frame, step in zip(frames, [50, 3, 7]):
+            self.assertTrue(np.array_equal(frame.positions, expected[step]))
+
+        # the underlying trajectory is closed together with the prefetcher
+        self.assertRaises(ChemfilesError, trajectory.read)
+
+    def test_close_early(self):
+        trajectory = Trajectory(get_data_path("water.xyz"))
+        with PrefetchingTrajectory(trajectory, prefetch=1) as prefetch:
+            frame = prefetch.read()
+            self.assertEqual(len(frame.atoms), 297)
+
+    def test_errors(self):
+        trajectory = Trajectory(get_data_path("water.xyz"))
+        self.assertRaises(ChemfilesError, PrefetchingTrajectory, trajectory, 0)
+
+        with remove_warnings:
+            with PrefetchingTrajectory(trajectory, steps=[1, 200, 2]) as prefetch:
+                prefetch.read()
+                self.assertRaises(ChemfilesError, prefetch.read)
+                self.assertRaises(ChemfilesError, prefetch.read)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -189,6 +189,35 @@ class TestTopology(unittest.TestCase):
             self.assertEqual(residue.name, "foo")
         self.assertEqual(i, 2)
 
+    def test_atoms_indexing(self):
+        topology = Topology()
+        topology.atoms.append(Atom("Zn"))
+        topology.atoms.append(Atom("C1", "C"))
+        topology.atoms.append(Atom("O"))
+
+        self.assertEqual(topology.atoms[-1].name, "O")
+        self.assertEqual([atom.name for atom in topology.atoms[:2]], ["Zn", "C1"])
+        self.assertEqual(
+            repr(topology.atoms), "[Atom('Zn'), Atom('C1', 'C'), Atom('O')]"
+        )
+
+        with self.assertRaises(IndexError):
+            topology.atoms[-4]
+
+    def test_atoms_arrays(self):
+        topology = Topology()
+        topology.atoms.append(Atom("Zn"))
+        topology.atoms.append(Atom("C1", "C"))
+
+        self.assertEqual(list(topology.atoms.names), ["Zn", "C1"])
+        self.assertEqual(list(topology.atoms.types), ["Zn", "C"])
+        self.assertTrue(np.array_equal(topology.atoms.atomic_numbers, [30, 6]))
+
+        topology.atoms.charges = [2, -1]
+        self.assertEqual(topology.atoms[0].charge, 2)
+        topology.atoms.masses = [65, 12]
+        self.assertTrue(np.array_equal(topology.atoms.masses, [65, 12]))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,18 +1,24 @@
+import io
+import json
+import mmap
 import os
+import threading
 import unittest
 
 import numpy as np
-from _utils import remove_warnings
+from _utils import get_data_path, remove_warnings
 
 from chemfiles import (
     Atom,
     ChemfilesError,
     Frame,
     MemoryTrajectory,
+    StreamingTrajectory,
     Topology,
     Trajectory,
     UnitCell,
 )
+from chemfiles.trajectory import TrajectorySlice
 
 EXPECTED_XYZ_TRAJECTORY = """4
 Properties=species:S:1:pos:R:3
@@ -23,11 +29,6 @@ X 1 2 3
 """
 
 
-def get_data_path(data):
-    root = os.path.dirname(__file__)
-    return os.path.join(root, "data", data)
-
-
 class TestTrajectory(unittest.TestCase):
     def test_repr(self):
         with Trajectory(get_data_path("topology.xyz")) as trajectory:
@@ -106,10 +107,407 @@ class TestTrajectory(unittest.TestCase):
         frame = trajectory.read()
         self.assertEqual(frame.atoms[100].name, "Rd")
 
+    def test_index(self):
+        frame = Frame()
+        frame.add_atom(Atom("X"), [1, 2, 3])
+        with Trajectory("test-tmp.xyz", "w") as trajectory:
+            trajectory.write(frame)
+            trajectory.write(frame)
+
+        with Trajectory("test-tmp.xyz", index=True) as trajectory:
+            self.assertEqual(trajectory.nsteps, 2)
+        self.assertTrue(os.path.exists("test-tmp.xyz.chfl-idx"))
+
+        # change the index to check that it is used
+        with open("test-tmp.xyz.chfl-idx") as fd:
+            index = json.load(fd)
+        self.assertEqual(index["nsteps"], 2)
+        index["nsteps"] = 42
+        with open("test-tmp.xyz.chfl-idx", "w") as fd:
+            json.dump(index, fd)
+
+        with Trajectory("test-tmp.xyz", index=True) as trajectory:
+            self.assertEqual(trajectory.nsteps, 42)
+
+        with Trajectory("test-tmp.xyz") as trajectory:
+            self.assertEqual(trajectory.nsteps, 2)
+
+        # the index is not valid anymore if the file changes
+        with Trajectory("test-tmp.xyz", "a") as trajectory:
+            trajectory.write(frame)
+
+        with Trajectory("test-tmp.xyz", index=True) as trajectory:
+            self.assertEqual(trajectory.nsteps, 3)
+
+        with open("test-tmp.xyz.chfl-idx") as fd:
+            self.assertEqual(json.load(fd)["nsteps"], 3)
+
+        os.unlink("test-tmp.xyz")
+        os.unlink("test-tmp.xyz.chfl-idx")
+
+    def test_getitem(self):
+        with Trajectory(get_data_path("water.xyz")) as trajectory:
+            expected = trajectory.read_positions()
+
+            frame = trajectory[41]
+            self.assertTrue(np.array_equal(frame.positions, expected[41]))
+            frame = trajectory[-1]
+            self.assertTrue(np.array_equal(frame.positions, expected[99]))
+
+            self.assertRaises(IndexError, trajectory.__getitem__, 100)
+            self.assertRaises(IndexError, trajectory.__getitem__, -101)
+
+            frames = trajectory[10:50:10]
+            self.assertEqual(len(frames), 4)
+            self.assertEqual(frames.steps, range(10, 50, 10))
+            for frame, step in zip(frames, [10, 20, 30, 40]):
+                self.assertTrue(np.array_equal(frame.positions, expected[step]))
+
+            frame = frames[1]
+            self.assertTrue(np.array_equal(frame.positions, expected[20]))
+            self.assertEqual(frames[1:].steps, range(20, 50, 10))
+
+            frames = trajectory[::-30]
+            self.assertEqual(len(frames), 4)
+            for frame, step in zip(frames, [99, 69, 39, 9]):
+                self.assertTrue(np.array_equal(frame.positions, expected[step]))
+
+            frames = trajectory[[17, 5, 900 % 100, 5, -1]]
+            self.assertEqual(frames.steps, [17, 5, 0, 5, 99])
+            frames_list = list(frames)
+            self.assertEqual(len(frames_list), 5)
+            self.assertIsNot(frames_list[1], frames_list[3])
+            for frame, step in zip(frames_list, frames.steps):
+                self.assertTrue(np.array_equal(frame.positions, expected[step]))
+
+            self.assertRaises(IndexError, trajectory.__getitem__, [3, 100])
+
+    def test_slice_read_ahead(self):
+        class CountingTrajectory(object):
+            def __init__(self, trajectory):
+                self.trajectory = trajectory
+                self.reads = []
+
+            def read_step(self, step):
+                self.reads.append(step)
+                return self.trajectory.read_step(step)
+
+        def reads_per_yield(steps):
+            counting = CountingTrajectory(trajectory)
+            counts = []
+            for step, frame in zip(steps, TrajectorySlice(counting, steps)):
+                self.assertTrue(np.array_equal(frame.positions, expected[step]))
+                counts.append(len(counting.reads))
+                counting.reads.clear()
+            return counts
+
+        with Trajectory(get_data_path("water.xyz")) as trajectory:
+            expected = trajectory.read_positions()
+
+            # decreasing ranges are read one step at the time
+            self.assertEqual(reads_per_yield(range(99, -1, -1)), [1] * 100)
+
+            # decreasing lists are read one step at the time until the
+            # remaining steps fit in the read ahead buffer
+            counts = reads_per_yield(list(range(99, -1, -3)))
+            self.assertEqual(counts, [1] * 18 + [16] + [0] * 15)
+
+            # close unsorted steps are read in increasing order
+            self.assertEqual(reads_per_yield([3, 1, 2, 0]), [4, 0, 0, 0])
+
+            # steps far ahead are not read ahead of time
+            steps = [95] + list(range(40)) + [95]
+            self.assertEqual(reads_per_yield(steps), [1] * 42)
+
+            rng = np.random.default_rng(12)
+            steps = [int(step) for step in rng.permutation(100)]
+            counts = reads_per_yield(steps + steps[:10])
+            self.assertLessEqual(max(counts), 16)
+            # each step is read at most once per time it is requested
+            self.assertLessEqual(sum(counts), 110)
+
+    def test_clone_reader(self):
+        trajectory = Trajectory(get_data_path("water.xyz"))
+        expected = trajectory.read_positions()
+
+        topology = Topology()
+        for i in range(297):
+            topology.atoms.append(Atom("Cs"))
+        trajectory.set_topology(topology)
+        trajectory.set_cell(UnitCell([30, 30, 30]))
+
+        trajectory.read_step(5)
+        clone = trajectory.clone_reader()
+        self.assertIsInstance(clone, Trajectory)
+        self.assertEqual(clone.path, trajectory.path)
+        self.assertEqual(clone.nsteps, 100)
+
+        frame = clone.read_step(41)
+        self.assertTrue(np.array_equal(frame.positions, expected[41]))
+        self.assertEqual(frame.atoms[10].name, "Cs")
+        self.assertEqual(frame.cell.lengths, (30.0, 30.0, 30.0))
+
+        # the clone is independent from the initial trajectory
+        clone.close()
+        frame = trajectory.read()
+        self.assertTrue(np.array_equal(frame.positions, expected[5]))
+
+        trajectory.set_topology(get_data_path("topology.xyz"), "XYZ")
+        clone = trajectory.clone_reader()
+        frame = clone.read()
+        self.assertEqual(frame.atoms[100].name, "Rd")
+
+        # read different steps from multiple threads
+        results = {}
+
+        def work(clone, steps):
+            for step in steps:
+                frame = clone.read_step(step)
+                results[step] = frame.positions.copy()
+            clone.close()
+
+        threads = [
+            threading.Thread(
+                target=work, args=(trajectory.clone_reader(), range(i, 100, 4))
+            )
+            for i in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), 100)
+        for step in range(100):
+            self.assertTrue(np.array_equal(results[step], expected[step]))
+
+        trajectory.close()
+        self.assertRaises(ChemfilesError, trajectory.clone_reader)
+
+        with Trajectory("test-tmp.xyz", "w") as trajectory:
+            self.assertRaises(ChemfilesError, trajectory.clone_reader)
+        os.unlink("test-tmp.xyz")
+
+    def test_read_into_frame(self):
+        with Trajectory(get_data_path("water.xyz")) as trajectory:
+            frame = Frame()
+            result = trajectory.read(frame)
+            self.assertIs(result, frame)
+            self.assertEqual(len(frame.atoms), 297)
+            first = frame.positions.copy()
+
+            result = trajectory.read_step(41, frame)
+            self.assertIs(result, frame)
+            self.assertTrue(
+                np.allclose(frame.positions[0], [0.761277, 8.106125, 10.622949])
+            )
+
+            trajectory.read_step(0, frame)
+            self.assertTrue(np.array_equal(frame.positions, first))
+
+            # reading into a frame invalidates the arrays
+            positions = frame.positions_view(refresh=False)
+            trajectory.read(frame)
+            self.assertRaises(ChemfilesError, lambda: positions[0])
+
+    def test_read_fields(self):
+        with Trajectory(get_data_path("water.xyz")) as trajectory:
+            data = trajectory.read_fields()
+            self.assertEqual(list(data.keys()), ["positions"])
+            self.assertEqual(data["positions"].shape, (297, 3))
+            self.assertTrue(
+                np.allclose(data["positions"][0], [0.417219, 8.303366, 11.737172])
+            )
+
+            fields = ["positions", "velocities", "cell", "step"]
+            data = trajectory.read_fields(fields, step=41)
+            self.assertTrue(
+                np.allclose(data["positions"][0], [0.761277, 8.106125, 10.622949])
+            )
+            self.assertIsNone(data["velocities"])
+            self.assertEqual(data["step"], 41)
+
+            frame = trajectory.read_step(41)
+            self.assertTrue(np.array_equal(data["positions"], frame.positions))
+            self.assertTrue(np.array_equal(data["cell"], frame.cell.matrix))
+
+            # data from the previous call is not modified by the next one
+            self.assertEqual(trajectory.read_fields(["step"], step=3)["step"], 3)
+            self.assertEqual(data["step"], 41)
+            self.assertTrue(np.array_equal(data["positions"], frame.positions))
+
+            self.assertRaises(ChemfilesError, trajectory.read_fields, ["bonds"])
+
+        frame = Frame()
+        frame.resize(3)
+        frame.add_velocities()
+        frame.velocities[1] = [1, 2, 3]
+        frame.cell = UnitCell([10, 11, 12])
+        trajectory = MemoryTrajectory(mode="w", format="GRO")
+        trajectory.write(frame)
+
+        trajectory = MemoryTrajectory(trajectory.buffer(), format="GRO")
+        data = trajectory.read_fields(["velocities", "cell"])
+        self.assertTrue(np.allclose(data["velocities"][1], [1, 2, 3]))
+        self.assertTrue(np.allclose(data["cell"], np.diag([10, 11, 12])))
+
+    def test_shared_topology(self):
+        with Trajectory(get_data_path("water.xyz")) as trajectory:
+            trajectory.read()
+            topology = trajectory.topology
+            self.assertIs(trajectory.topology, topology)
+            self.assertEqual(len(topology.atoms), 297)
+            self.assertEqual(topology.atoms[0].name, "O")
+            # loading the topology does not change the current step
+            self.assertEqual(trajectory.read().step, 1)
+
+            # the shared topology is read-only
+            message = (
+                "this topology is shared by all steps and read-only, "
+                "use copy.copy() to modify it"
+            )
+            with self.assertRaises(ChemfilesError) as context:
+                topology.resize(3)
+            self.assertEqual(str(context.exception), message)
+            self.assertRaises(ChemfilesError, topology.add_bond, 0, 1)
+            with self.assertRaises(ChemfilesError) as context:
+                topology.atoms[0].name = "Zn"
+            self.assertEqual(str(context.exception), message)
+            with self.assertRaises(ChemfilesError) as context:
+                topology.atoms.masses = 1.0
+            self.assertEqual(str(context.exception), message)
+            copy = Topology.__copy__(topology)
+            copy.atoms[0].name = "Zn"
+            self.assertEqual(topology.atoms[0].name, "O")
+
+            copy.resize(297)
+            trajectory.set_topology(copy)
+            self.assertIsNot(trajectory.topology, topology)
+            self.assertEqual(trajectory.topology.atoms[0].name, "Zn")
+
+            frame = trajectory.read()
+            frame.topology = trajectory.topology
+            self.assertEqual(frame.atoms[0].name, "Zn")
+
+            trajectory.set_topology(get_data_path("topology.xyz"), "XYZ")
+            self.assertEqual(trajectory.topology.atoms[0].name, "Rd")
+
+        trajectory = MemoryTrajectory(mode="w", format="XYZ")
+        with self.assertRaises(ChemfilesError) as context:
+            trajectory.topology
+        self.assertIn("set_topology", str(context.exception))
+
+        topology = Topology()
+        topology.resize(3)
+        trajectory.set_topology(topology)
+        self.assertEqual(len(trajectory.topology.atoms), 3)
+
+    def test_read_positions(self):
+        with Trajectory(get_data_path("water.xyz")) as trajectory:
+            positions = trajectory.read_positions()
+            self.assertEqual(positions.shape, (100, 297, 3))
+            self.assertEqual(positions.dtype, np.float64)
+
+            frame = trajectory.read_step(41)
+            self.assertTrue(np.array_equal(positions[41], frame.positions))
+
+            positions = trajectory.read_positions(10, 50, 20)
+            self.assertEqual(positions.shape, (2, 297, 3))
+            frame = trajectory.read_step(30)
+            self.assertTrue(np.array_equal(positions[1], frame.positions))
+
+            out = np.zeros((3, 297, 3), dtype=np.float32)
+            result = trajectory.read_positions(0, 3, out=out)
+            self.assertIs(result, out)
+            frame = trajectory.read_step(2)
+            self.assertTrue(np.array_equal(out[2], frame.positions.astype(np.float32)))
+
+            positions = trajectory.read_positions(5, 5)
+            self.assertEqual(positions.shape, (0, 0, 3))
+
+            out = np.zeros((3, 10, 3))
+            self.assertRaises(ChemfilesError, trajectory.read_positions, 0, 3, out=out)
+            self.assertRaises(ChemfilesError, trajectory.read_positions, 0, 4, out=out)
+
+    def test_bool(self):
+        trajectory = MemoryTrajectory(mode="w", format="XYZ")
+        self.assertEqual(len(trajectory), 0)
+        self.assertTrue(trajectory)
+
+        with Trajectory(get_data_path("water.xyz")) as trajectory:
+            self.assertTrue(trajectory)
+            # checking the truth value does not count the steps
+            self.assertIsNone(trajectory._BaseTrajectory__nsteps)
+
+    def test_numpy_index(self):
+        with Trajectory(get_data_path("water.xyz")) as trajectory:
+            self.assertEqual(trajectory[np.int64(5)].step, 5)
+            self.assertEqual(trajectory[np.uint32(7)].step, 7)
+            self.assertEqual(trajectory[np.int32(-1)].step, 99)
+
+            steps = [frame.step for frame in trajectory[np.array([3, -2, 1])]]
+            self.assertEqual(steps, [3, 98, 1])
+
+            self.assertRaises(TypeError, trajectory.__getitem__, True)
+            self.assertRaises(TypeError, trajectory.__getitem__, [1, False])
+            self.assertRaises(TypeError, trajectory.__getitem__, 1.0)
+
+    def test_read_positions_range(self):
+        with Trajectory(get_data_path("water.xyz")) as trajectory:
+            expected = trajectory.read_positions()
+
+            positions = trajectory.read_positions(-2)
+            self.assertTrue(np.array_equal(positions, expected[-2:]))
+            positions = trajectory.read_positions(10, -80, 3)
+            self.assertTrue(np.array_equal(positions, expected[10:-80:3]))
+            positions = trajectory.read_positions(5, stride=-2)
+            self.assertTrue(np.array_equal(positions, expected[5::-2]))
+
+            self.assertRaises(IndexError, trajectory.read_positions, -101)
+            self.assertRaises(IndexError, trajectory.read_positions, 0, 101)
+            self.assertRaises(IndexError, trajectory.read_positions, 100, 0, -1)
+
     def test_protocols(self):
         with Trajectory(get_data_path("water.xyz")) as trajectory:
             for frame in trajectory:
                 self.assertEqual(len(frame.atoms), 297)
+            self.assertEqual(len(trajectory), 100)
+
+    def test_nsteps(self):
+        with Trajectory(get_data_path("water.xyz")) as trajectory:
+            self.assertEqual(trajectory.nsteps, 100)
+            self.assertEqual(trajectory.refresh(), 100)
+
+        frame = Frame()
+        frame.add_atom(Atom("X"), [1, 2, 3])
+        with Trajectory("test-tmp.xyz", "w") as trajectory:
+            self.assertEqual(trajectory.nsteps, 0)
+            trajectory.write(frame)
+            self.assertEqual(trajectory.nsteps, 1)
+            trajectory.write(frame)
+            self.assertEqual(len(trajectory), 2)
+
+        with Trajectory("test-tmp.xyz") as trajectory:
+            trajectory.set_cell(UnitCell([10, 10, 10]))
+            self.assertEqual(trajectory.nsteps, 2)
+            trajectory.read()
+            with Trajectory("test-tmp.xyz", "a") as output:
+                frame.positions[0] = [4, 5, 6]
+                output.write(frame)
+
+            # the cached value is used until refresh is called
+            self.assertEqual(trajectory.nsteps, 2)
+            self.assertEqual(trajectory.refresh(), 3)
+            self.assertEqual(trajectory.nsteps, 3)
+
+            # refresh re-opens the file, starting again from the first step
+            frame = trajectory.read()
+            self.assertEqual(frame.positions[0].tolist(), [1, 2, 3])
+            frame = trajectory.read_step(2)
+            self.assertEqual(frame.positions[0].tolist(), [4, 5, 6])
+            self.assertEqual(frame.cell.lengths, (10, 10, 10))
+
+        os.unlink("test-tmp.xyz")
 
     def test_close(self):
         trajectory = Trajectory(get_data_path("water.xyz"))
@@ -129,6 +527,47 @@ class TestTrajectory(unittest.TestCase):
 
         os.unlink("test-tmp.xyz")
 
+    def test_write_positions(self):
+        positions = np.random.random((5, 4, 3))
+        topology = Topology()
+        for i in range(4):
+            topology.atoms.append(Atom("Zn"))
+
+        with Trajectory("test-tmp.xyz", "w") as trajectory:
+            trajectory.write_positions(
+                positions, topology=topology, cell=UnitCell([10, 11, 12])
+            )
+            self.assertEqual(trajectory.nsteps, 5)
+
+        with Trajectory("test-tmp.xyz") as trajectory:
+            self.assertTrue(np.allclose(trajectory.read_positions(), positions))
+            frame = trajectory.read_step(3)
+            self.assertEqual(frame.atoms[2].name, "Zn")
+            self.assertEqual(frame.cell.lengths, (10.0, 11.0, 12.0))
+
+        os.unlink("test-tmp.xyz")
+
+        velocities = np.random.random((2, 4, 3))
+        trajectory = MemoryTrajectory(mode="w", format="GRO")
+        trajectory.write_positions(positions[:2], velocities=velocities, steps=[10, 20])
+        trajectory = MemoryTrajectory(trajectory.buffer(), "r", "GRO")
+        frame = trajectory.read_step(1)
+        # GRO files store data with limited precision
+        self.assertTrue(np.allclose(frame.positions, positions[1], atol=1e-2))
+        self.assertTrue(np.allclose(frame.velocities, velocities[1], atol=1e-2))
+
+        trajectory = MemoryTrajectory(mode="w", format="XYZ")
+        self.assertRaises(ChemfilesError, trajectory.write_positions, np.zeros((4, 3)))
+        self.assertRaises(
+            ChemfilesError, trajectory.write_positions, positions, steps=[1, 2]
+        )
+        self.assertRaises(
+            ChemfilesError,
+            trajectory.write_positions,
+            positions,
+            velocities=velocities,
+        )
+
 
 class TestMemoryTrajectory(unittest.TestCase):
     def test_read(self):
@@ -150,6 +589,55 @@ Fe 4 3 2
         frame = trajectory.read()
         self.assertEqual(len(frame.atoms), 1)
 
+    def test_clone_reader(self):
+        trajectory = MemoryTrajectory("1\n\nFe 4 3 2\n", "r", "XYZ")
+        clone = trajectory.clone_reader()
+        self.assertEqual(clone.read().atoms[0].name, "Fe")
+        self.assertEqual(trajectory.read().atoms[0].name, "Fe")
+
+        trajectory = MemoryTrajectory(mode="w", format="XYZ")
+        self.assertRaises(ChemfilesError, trajectory.clone_reader)
+
+    def test_read_buffers(self):
+        data = b"""1
+
+Fe 4 3 2
+1
+
+Cu 4 3 2
+"""
+        for buffer in [
+            data,
+            bytearray(data),
+            memoryview(data),
+            np.frombuffer(data, dtype=np.uint8),
+        ]:
+            trajectory = MemoryTrajectory(buffer, "r", "XYZ")
+            self.assertEqual(trajectory.nsteps, 2)
+            frame = trajectory.read_step(1)
+            self.assertEqual(frame.atoms[0].name, "Cu")
+
+        with open("test-tmp.xyz", "wb") as fd:
+            fd.write(data)
+
+        with open("test-tmp.xyz", "rb") as fd:
+            with mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                trajectory = MemoryTrajectory(buffer, "r", "XYZ")
+                frame = trajectory.read()
+                self.assertEqual(frame.atoms[0].name, "Fe")
+                trajectory.close()
+
+        os.unlink("test-tmp.xyz")
+
+        self.assertRaises(ChemfilesError, MemoryTrajectory, [1, 2], "r", "XYZ")
+        self.assertRaises(
+            ChemfilesError, MemoryTrajectory, memoryview(data)[::2], "r", "XYZ"
+        )
+
+    def test_repr(self):
+        trajectory = MemoryTrajectory("", "r", "XYZ")
+        self.assertEqual(trajectory.__repr__(), "MemoryTrajectory('r', 'XYZ')")
+
     def test_write(self):
         trajectory = MemoryTrajectory(mode="w", format="XYZ")
         frame = Frame()
@@ -159,6 +647,101 @@ Fe 4 3 2
 
         self.assertEqual(trajectory.buffer().decode("utf8"), EXPECTED_XYZ_TRAJECTORY)
 
+        buffer = trajectory.buffer(copy=False)
+        self.assertEqual(buffer.dtype, np.uint8)
+        self.assertFalse(buffer.flags.writeable)
+        self.assertEqual(buffer.tobytes().decode("utf8"), EXPECTED_XYZ_TRAJECTORY)
+
+        # the array keeps the trajectory alive
+        del trajectory
+        self.assertEqual(buffer.tobytes().decode("utf8"), EXPECTED_XYZ_TRAJECTORY)
+
+    def test_empty_buffer(self):
+        trajectory = MemoryTrajectory(mode="w", format="XYZ")
+        self.assertEqual(trajectory.buffer(), b"")
+        self.assertEqual(len(trajectory.buffer(copy=False)), 0)
+
+
+class TestStreamingTrajectory(unittest.TestCase):
+    def test_write(self):
+        frame = Frame()
+        for i in range(4):
+            frame.add_atom(Atom("X"), [1, 2, 3])
+
+        output = io.BytesIO()
+        with StreamingTrajectory(output, "XYZ") as trajectory:
+            trajectory.write(frame)
+            self.assertEqual(output.getvalue().decode("utf8"), EXPECTED_XYZ_TRAJECTORY)
+            trajectory.write(frame)
+            self.assertEqual(trajectory.nsteps, 2)
+
+        self.assertEqual(output.getvalue().decode("utf8"), 2 * EXPECTED_XYZ_TRAJECTORY)
+
+        trajectory = MemoryTrajectory(output.getvalue(), "r", "XYZ")
+        self.assertEqual(trajectory.nsteps, 2)
+
+    def test_del(self):
+        frame = Frame()
+        for i in range(4):
+            frame.add_atom(Atom("X"), [1, 2, 3])
+
+        # data buffered below flush_size is sent when the trajectory is
+        # garbage collected
+        chunks = []
+        trajectory = StreamingTrajectory(chunks.append, "XYZ", flush_size=10000)
+        trajectory.write(frame)
+        self.assertEqual(chunks, [])
+        del trajectory
+        self.assertEqual(b"".join(chunks).decode("utf8"), EXPECTED_XYZ_TRAJECTORY)
+
+        # a failed close is not retried when garbage collecting
+        calls = []
+
+        def failing_output(data):
+            calls.append(data)
+            raise OSError("disk full")
+
+        trajectory = StreamingTrajectory(failing_output, "XYZ", flush_size=10000)
+        trajectory.write(frame)
+        self.assertRaises(OSError, trajectory.close)
+        self.assertRaises(ChemfilesError, trajectory.write, frame)
+        self.assertRaises(ChemfilesError, trajectory.close)
+        del trajectory
+        self.assertEqual(len(calls), 1)
+
+    def test_flush_size(self):
+        frame = Frame()
+        for i in range(4):
+            frame.add_atom(Atom("X"), [1, 2, 3])
+
+        topology = Topology()
+        for i in range(4):
+            topology.atoms.append(Atom("Y"))
+
+        chunks = []
+        stream = StreamingTrajectory(chunks.append, "XYZ", flush_size=150)
+        stream.set_topology(topology)
+        stream.set_cell(UnitCell([10, 10, 10]))
+
+        stream.write(frame)
+        self.assertEqual(len(chunks), 0)
+        stream.write(frame)
+        self.assertEqual(len(chunks), 1)
+        stream.write(frame)
+        self.assertEqual(len(chunks), 1)
+        stream.close()
+        self.assertEqual(len(chunks), 2)
+        self.assertRaises(ChemfilesError, stream.write, frame)
+
+        # cell and topology are used for all chunks
+        trajectory = MemoryTrajectory(b"".join(chunks), "r", "XYZ")
+        self.assertEqual(trajectory.nsteps, 3)
+        for frame in trajectory:
+            self.assertEqual(frame.atoms[3].name, "Y")
+            self.assertEqual(frame.cell.lengths, (10.0, 10.0, 10.0))
+
+        self.assertRaises(ChemfilesError, StreamingTrajectory, None, "XYZ")
+
 
 if __name__ == "__main__":
     unittest.main()